@@ -0,0 +1,475 @@
+#!/usr/bin/env python3
+# solar-python — Solar data calculation and prediction library for Python
+# Copyright © 2014, 2015  Mattias Andrée (maandree@member.fsf.org)
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+'''
+Benchmark suite for solar-python
+
+Times scalar calls, prediction calls across latitudes, including polar
+edge cases, and long date sweeps, and reports calls per second and, for
+predictions, the number of function evaluations per prediction. The
+results can be saved as a JSON baseline, and compared against a saved
+baseline, in which case the exit status is 1 if any benchmark regressed,
+and 2 if the baseline was saved in another file format version.
+
+Every public function of solar-python is benchmarked, except those listed
+in `UNTIMED`; those that only take a time are found automatically, and the
+exit status is 1 if any other public function has no benchmark. The number
+of evaluations per prediction is measured by calling the public functions
+with a `PredictionStatsCollector` installed.
+
+Usage: solar_bench.py [--filter TEXT] [--quick] [--save FILE] [--baseline FILE]
+                      [--threshold FRACTION] [--min-time SECONDS] [--repeat N]
+'''
+
+import io
+import os
+import sys
+import json
+import time
+import argparse
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+import solar_python as solar
+
+
+
+T = 0.2
+'''
+:float  The time, in Julian Centuries, around which all benchmarks are run
+'''
+
+TIMES = [T + i * 0.01 / 12 for i in range(12)]
+'''
+:list<float>  One time per month of a year, in Julian Centuries
+'''
+
+LATITUDES = (0.0, 45.0, 60.0, 66.0, 67.0, 70.0, 80.0, 89.0)
+'''
+:tuple<float>  The latitudes the prediction benchmarks are run at,
+               66° and above are polar edge cases
+'''
+
+LONGITUDE = 18.0
+'''
+:float  The longitude the benchmarks are run at
+'''
+
+FORMAT_VERSION = 2
+'''
+:int  The version of the baseline file format
+'''
+
+UNTIMED = {'main'                     : 'runs the command line interface',
+           'sleep_until'              : 'sleeps',
+           'wait_for_elevation'       : 'sleeps',
+           'solar_events'             : 'sleeps',
+           'use_ephemeris'            : 'installs global state',
+           'use_ephemeris_file'       : 'installs global state',
+           'use_prediction_executor'  : 'installs global state',
+           'use_prediction_observer'  : 'installs global state',
+           'use_season_table'         : 'installs global state',
+           'open_ephemeris_file'      : 'measures the file system',
+           'write_ephemeris_file'     : 'measures the file system',
+           'solar_elevation_raster'   : 'measures the file system'}
+'''
+:dict<str, str>  The public functions that are deliberately not benchmarked, and why
+'''
+
+
+def cycle(fun, args):
+    '''
+    Create a function that calls a function with the next arguments
+    in a list each time it is called, wrapping around at the end
+
+    @param   fun:(...)→¿R?       The function to call
+    @param   args:list<tuple>    The arguments for each call
+    @return  :()→¿R?             The function
+    '''
+    state = [0]
+    def rc():
+        i = state[0]
+        state[0] = (i + 1) % len(args)
+        return fun(*args[i])
+    return rc
+
+
+def evaluations(fun, args):
+    '''
+    Create a function that calculates the average number of times the
+    predicted function is evaluated per prediction, as reported to a
+    `PredictionStatsCollector`, when a function is called once with
+    each of a list of arguments
+
+    @param   fun:(...)→¿R?         The function to call
+    @param   args:list<tuple>      The arguments for each call
+    @return  :()→float?            The function, which returns `None`
+                                   if no predictions were made
+    '''
+    def rc():
+        collector = solar.PredictionStatsCollector()
+        previous = solar.use_prediction_observer(collector)
+        try:
+            for a in args:
+                fun(*a)
+        finally:
+            solar.use_prediction_observer(previous)
+        if not collector.predictions:
+            return None
+        return collector.evaluations / collector.predictions
+    return rc
+
+
+def consume(fun):
+    '''
+    Create a function that calls a function and exhausts the iterator it returns
+
+    @param   fun:(...)→itr<¿R?>  The function
+    @return  :(...)→list<¿R?>    The function
+    '''
+    return lambda *args : list(fun(*args))
+
+
+def run_async(fun):
+    '''
+    Create a function that runs a coroutine function in a new event loop
+
+    @param   fun:(...)→coroutine<¿R?>  The function
+    @return  :(...)→¿R?                The function
+    '''
+    import asyncio
+    return lambda *args : asyncio.run(fun(*args))
+
+
+class Discard(object):
+    '''
+    A file that discards everything written to it
+    '''
+    def write(self, data):
+        return len(data)
+
+
+def public_functions():
+    '''
+    List the public functions of solar-python
+
+    @return  :list<str>  The names of the functions
+    '''
+    import inspect
+    return [name for (name, value) in sorted(vars(solar).items())
+            if not name.startswith('_') and inspect.isfunction(value) and value.__module__ == solar.__name__]
+
+
+def benchmarks(quick):
+    '''
+    List all benchmarks
+
+    @param   quick:bool  Whether to skip the slowest benchmarks
+    @return  :(list<(str, ()→void, (()→float?)?)>, list<str>)  The name of each benchmark, the
+                                                              function to time, and a function
+                                                              that returns the number of
+                                                              evaluations per prediction, if
+                                                              applicable; and the names of the
+                                                              public functions that are neither
+                                                              benchmarked nor listed in `UNTIMED`
+    '''
+    import math, inspect
+    lon = LONGITUDE
+    ts = [(t,) for t in TIMES]
+    rc, covered = [], set()
+    def add(name, fun, evals = None, slow = False):
+        covered.add(name.split('/')[1].split('(')[0])
+        if not (quick and slow):
+            rc.append((name, fun, evals))
+    def call(category, name, args, wrap = None, slow = False):
+        fun = getattr(solar, name) if wrap is None else wrap(getattr(solar, name))
+        add('%s/%s' % (category, name), cycle(fun, args), evaluations(fun, args), slow)
+
+    # Scalar calls
+    for (category, name) in (('scalar', 'epoch'), ('scalar', 'julian_day'), ('scalar', 'julian_centuries'),
+                             ('scalar', 'calendar_columns'), ('scalar', 'get_season_table'),
+                             ('scalar', 'get_prediction_executor')):
+        call(category, name, [()])
+    call('scalar', 'epoch_to_julian_day', [(solar.julian_centuries_to_epoch(t),) for t in TIMES])
+    call('scalar', 'julian_day_to_epoch', [(solar.julian_centuries_to_julian_day(t),) for t in TIMES])
+    call('scalar', 'julian_day_to_julian_centuries', [(solar.julian_centuries_to_julian_day(t),) for t in TIMES])
+    call('scalar', 'degrees', [(1.0,)])
+    call('scalar', 'radians', [(1.0,)])
+    call('scalar', 'fast_precision', [('fast',)])
+    decl = [solar.solar_declination(t) for t in TIMES]
+    call('scalar', 'hour_angle_from_elevation', [(50.0, d, solar.radians(-6.0)) for d in decl])
+    call('scalar', 'elevation_from_hour_angle', [(50.0, d, 1.0) for d in decl])
+    call('scalar', 'azimuth_from_hour_angle', [(50.0, d, 1.0) for d in decl])
+    for name in ('solar_elevation', 'solar_elevation_derivative', 'solar_elevation_fast',
+                 'solar_elevation_derivative_fast', 'solar_azimuth', 'solar_position'):
+        call('scalar', name, [(50.0, lon, t) for t in TIMES])
+    for name in ('solar_elevation_from_time', 'solar_position_from_time'):
+        call('scalar', name, [(t, 50.0, lon) for t in TIMES])
+    call('scalar', 'solar_elevation_fast_from',
+         [(math.sin(solar.radians(50.0)), math.cos(solar.radians(50.0)), lon, t) for t in TIMES])
+    call('scalar', 'have_sunrise_and_sunset', [(70.0, t) for t in TIMES])
+    call('scalar', 'is_summer', [(50.0, t) for t in TIMES])
+    call('scalar', 'is_winter', [(50.0, t) for t in TIMES])
+    call('scalar', 'time_of_solar_noon', [(t, lon) for t in TIMES])
+    call('scalar', 'time_of_solar_elevation', [(t - 0.00001, t, 50.0, lon, solar.radians(-6.0)) for t in TIMES])
+    call('scalar', 'solar_noon_or_midnight', [(0.01 / 2000, lon, t) for t in TIMES])
+    call('scalar', 'daily_events', [(50.0, lon, t) for t in TIMES])
+    call('scalar', 'daily_events_near_noon', [(50.0, lon, solar.time_of_solar_noon(t, lon)) for t in TIMES])
+    call('scalar', 'sunrise_equation', [(50.0, lon, t) for t in TIMES])
+    call('scalar', 'time_above_elevation', [(50.0, lon, -6.0, t) for t in TIMES])
+    call('scalar', 'polar_periods', [(70.0, 2020)])
+    call('scalar', 'solar_state_from', [(t, math.sin, math.cos, math.tan, math.asin) for t in TIMES])
+    call('scalar', 'solar_ephemeris_fast_from', [(t, math.sin, math.cos) for t in TIMES])
+    call('scalar', 'solar_hour_angle_from', [(t, lon, solar.equation_of_time(t), math.trunc) for t in TIMES])
+    call('scalar', 'solar_state_derivative_from', [(t, solar.solar_state(t), math.sin, math.cos, math.tan) for t in TIMES])
+    acos = lambda x : math.acos(-1.0 if x < -1 else 1.0 if x > 1 else x)
+    call('scalar', 'sunrise_equation_from',
+         [(50.0, lon, t, -0.833, math.sin, math.cos, math.asin, acos, math.floor, math.sqrt) for t in TIMES])
+    table = solar.ChebyshevEphemeris(T, T + 0.01)
+    add('scalar/ChebyshevEphemeris.lookup', cycle(table.lookup, ts))
+
+    # Every other public function that only takes a time, so that new ones are not missed
+    for name in public_functions():
+        if name not in covered and name not in UNTIMED and not name.endswith('_array'):
+            if list(inspect.signature(getattr(solar, name)).parameters) == ['t']:
+                call('scalar', name, ts)
+
+    # Predictions
+    elev = solar.SOLAR_ELEVATION_SUNSET_SUNRISE
+    for lat in LATITUDES:
+        args = [(lat, lon, elev, t) for t in TIMES]
+        add('prediction/future_elevation(%g)' % lat, cycle(solar.future_elevation, args),
+            evaluations(solar.future_elevation, args))
+        add('prediction/past_elevation(%g)' % lat, cycle(solar.past_elevation, args),
+            evaluations(solar.past_elevation, args))
+    for name in ('future_elevation_derivative', 'past_elevation_derivative'):
+        call('prediction', name, [(50.0, lon, 0.0, t) for t in TIMES])
+    for name in ('future_azimuth', 'past_azimuth'):
+        call('prediction', name, [(50.0, lon, 180.0, t) for t in TIMES])
+    call('prediction', 'future_past_elevation', [(0.01 / 2000, 50.0, lon, elev, t) for t in TIMES])
+    call('prediction', 'future_past_elevation_derivative', [(0.01 / 2000, 50.0, lon, 0.0, t) for t in TIMES])
+    call('prediction', 'future_past_azimuth', [(0.01 / 2000, 50.0, lon, 180.0, t) for t in TIMES])
+    for name in ('future_equinox', 'past_equinox', 'future_solstice', 'past_solstice'):
+        call('prediction', name, ts)
+    for name in ('future_past_equinox', 'future_past_solstice'):
+        call('prediction', name, [(0.01 / 100, t) for t in TIMES])
+    fun = lambda t : solar.solar_elevation(50.0, lon, t)
+    call('prediction', 'solar_prediction', [(0.01 / 2000, -6.0, fun, 0.000001, 0.01, t) for t in TIMES])
+    call('prediction', 'solar_prediction_brent', [(0.01 / 2000, -6.0, fun, solar.PREDICTION_TOLERANCE, 0.01, t)
+                                                  for t in TIMES])
+    noons = [solar.time_of_solar_noon(t, lon) for t in TIMES]
+    call('prediction', 'brent_bracketed', [(n - 0.5 / 36525, n, fun(n - 0.5 / 36525) + 6.0, fun(n) + 6.0, -6.0,
+                                            fun, solar.PREDICTION_TOLERANCE) for n in noons])
+    call('prediction', 'run_prediction', [(solar.future_elevation, 50.0, lon, elev, t) for t in TIMES],
+         wrap = run_async)
+
+    # Long date sweeps
+    minutes = [T + i / 1440 / 36525 for i in range(1440)]
+    add('sweep/solar_elevation(1 day, every minute)',
+        lambda : [solar.solar_elevation(50.0, lon, t) for t in minutes])
+    call('sweep', 'solar_elevation_series', [(50.0, lon, T, 1 / 1440 / 36525, 1440)], wrap = consume)
+    add('sweep/solar_calendar(10 years)', lambda : list(solar.solar_calendar(50.0, lon, T, 3653)))
+    add('sweep/solar_calendar(10 years, 80°)', lambda : list(solar.solar_calendar(80.0, lon, T, 3653)))
+    sites = [(50.0, lon), (80.0, lon), (-33.9, 151.2)]
+    call('sweep', 'calendar_rows', [(sites, T, 30)], wrap = consume)
+    call('sweep', 'calendar_chunk', [(sites, T, 30)])
+    call('sweep', 'write_calendar_binary', [(Discard(), sites, T, 30)])
+    call('sweep', 'write_calendar_csv', [(Discard(), sites, T, 30)])
+    add('sweep/SeasonTable(200 years)', lambda : solar.SeasonTable(-1.0, 1.0), slow = True)
+    add('sweep/ChebyshevEphemeris(10 years)', lambda : solar.ChebyshevEphemeris(T, T + 0.1), slow = True)
+    add('sweep/future_elevation(1 year of sunrises)', lambda : sunrise_sweep(50.0, 365), slow = True)
+    call('sweep', 'bulk_calendar', [(sites, T, 30)], wrap = consume, slow = True)
+    call('sweep', 'bulk_calendar_async', [(sites, T, 30)], wrap = lambda f : run_async(collect(f)), slow = True)
+
+    # Vectorised functions, if NumPy is available
+    try:
+        import numpy
+    except ImportError:
+        return (rc, [name for name in public_functions() if name not in covered and name not in UNTIMED])
+    many = numpy.linspace(T, T + 0.01, 100000)
+    lats = numpy.linspace(-89.0, 89.0, 100000)
+    add('vector/solar_elevation_array(100000)', lambda : solar.solar_elevation_array(lats, lon, many))
+    add('vector/solar_state_array(100000)', lambda : solar.solar_state_array(many))
+    grid_lat, grid_lon = numpy.arange(-90.0, 90.01, 0.5), numpy.arange(-180.0, 180.0, 0.5)
+    add('vector/solar_elevation_grid(0.5°)', lambda : solar.solar_elevation_grid(grid_lat, grid_lon, T))
+    vt, vl = numpy.linspace(T, T + 0.01, 1000), numpy.linspace(-60.0, 60.0, 1000)
+    vd = solar.solar_declination_array(vt)
+    for name in public_functions():
+        if name.endswith('_array') and name not in covered and name not in UNTIMED:
+            if list(inspect.signature(getattr(solar, name)).parameters) == ['t']:
+                call('vector', name, [(vt,)])
+    for name in ('hour_angle_from_elevation_array', 'elevation_from_hour_angle_array', 'azimuth_from_hour_angle_array'):
+        call('vector', name, [(vl, vd, solar.radians(-6.0) if name.startswith('hour') else 1.0)])
+    for name in ('solar_position_array', 'sunrise_equation_array'):
+        call('vector', name, [(vl, lon, vt)])
+    call('vector', 'solar_elevation_from_time_array', [(vt, vl, lon)])
+    call('vector', 'have_sunrise_and_sunset_array', [(vl, vt)])
+    call('vector', 'time_of_solar_noon_array', [(vt, lon)])
+    call('vector', 'time_of_solar_elevation_array', [(vt - 0.00001, vt, vl, lon, solar.radians(-6.0))])
+    call('vector', 'time_above_elevation_array', [(vl, lon, -6.0, vt)])
+    call('vector', 'daily_durations_array', [(vl[::100], lon, T, 30)])
+    for name in ('future_elevation_array', 'past_elevation_array'):
+        call('vector', name, [(vl, lon, elev, vt)])
+    call('vector', 'future_past_elevation_array', [(True, vl, lon, elev, vt)])
+    call('vector', 'season_array', [(True, True, vt)])
+    call('vector', 'polar_periods_array', [(numpy.linspace(-89.0, 89.0, 1000), 2020)])
+    call('vector', 'solar_elevation_series_array', [(50.0, lon, T, 1 / 1440 / 36525, 1440)])
+    call('vector', 'solar_elevation_grids', [(grid_lat[::4], grid_lon[::4], vt[:10])])
+    call('vector', 'elevation_boundary_array', [(-6.0, T)])
+    call('vector', 'terminator_array', [(T,)])
+    data = io.BytesIO()
+    solar.write_calendar_binary(data, sites, T, 30)
+    call('vector', 'read_calendar_binary', [(data.getvalue(),)])
+    return (rc, [name for name in public_functions() if name not in covered and name not in UNTIMED])
+
+
+def collect(fun):
+    '''
+    Create a coroutine function that collects the items
+    of the asynchronous iterator a function returns
+
+    @param   fun:(...)→async-itr<¿R?>  The function
+    @return  :(...)→coroutine<list<¿R?>>  The function
+    '''
+    async def rc(*args):
+        return [item async for item in fun(*args)]
+    return rc
+
+
+def sunrise_sweep(latitude, days):
+    '''
+    Predict consecutive sunrises with `future_elevation`
+
+    @param  latitude:float  The latitude of the observer
+    @param  days:int        The number of sunrises
+    '''
+    t = T
+    for _ in range(days):
+        t = solar.future_elevation(latitude, LONGITUDE, solar.SOLAR_ELEVATION_SUNSET_SUNRISE, t)
+        if t is None:
+            break
+        t += 1 / 36525 / 24
+
+
+def measure(fun, min_time, repeat):
+    '''
+    Measure how many times per second a function can be called
+
+    @param   fun:()→void      The function
+    @param   min_time:float   The minimum number of seconds to run each repetition
+    @param   repeat:int       The number of repetitions, the best is used
+    @return  :float           The number of calls per second
+    '''
+    n, best = 1, 0.0
+    for _ in range(repeat):
+        while True:
+            start = time.perf_counter()
+            for _itr in range(n):
+                fun()
+            elapsed = time.perf_counter() - start
+            if elapsed >= min_time:
+                break
+            n = max(n * 2, int(n * min_time / max(elapsed, 1e-9) * 1.2))
+        best = max(best, n / elapsed)
+    return best
+
+
+def compare(results, baseline, threshold):
+    '''
+    Compare results against a baseline
+
+    @param   results:dict<str, dict>   The results
+    @param   baseline:dict<str, dict>  The results of the baseline
+    @param   threshold:float           The fraction by which the calls per second may
+                                       drop, or the evaluations increase, before it
+                                       is considered a regression
+    @return  :list<str>                Description of each regression
+    '''
+    rc = []
+    for (name, result) in results.items():
+        if name not in baseline:
+            continue
+        base = baseline[name]
+        if result['calls_per_second'] < base['calls_per_second'] * (1 - threshold):
+            rc.append('%s: %.4g calls/s, baseline %.4g calls/s' % (name, result['calls_per_second'], base['calls_per_second']))
+        if result.get('evaluations') is not None and base.get('evaluations') is not None:
+            if result['evaluations'] > base['evaluations'] * (1 + threshold):
+                rc.append('%s: %.4g evaluations, baseline %.4g evaluations' % (name, result['evaluations'], base['evaluations']))
+    return rc
+
+
+def main(argv):
+    '''
+    Run the benchmark suite
+
+    @param   argv:list<str>  The command line arguments, excluding the program name
+    @return  :int            The exit status
+    '''
+    parser = argparse.ArgumentParser(description = 'Benchmark solar-python')
+    parser.add_argument('--filter', default = '', help = 'only run benchmarks whose name contain this text')
+    parser.add_argument('--quick', action = 'store_true', help = 'skip the slowest benchmarks')
+    parser.add_argument('--save', metavar = 'FILE', help = 'save the results as a JSON baseline')
+    parser.add_argument('--baseline', metavar = 'FILE', help = 'compare against a saved baseline')
+    parser.add_argument('--threshold', type = float, default = 0.25,
+                        help = 'allowed slowdown, as a fraction, before flagging a regression')
+    parser.add_argument('--min-time', type = float, default = 0.2, help = 'minimum seconds per repetition')
+    parser.add_argument('--repeat', type = int, default = 3, help = 'number of repetitions')
+    args = parser.parse_args(argv)
+
+    baseline = None
+    if args.baseline is not None:
+        with open(args.baseline, 'r') as file:
+            baseline = json.load(file)
+        if baseline.get('version') != FORMAT_VERSION:
+            print('%s: unsupported baseline version: %r, expected %i'
+                  % (args.baseline, baseline.get('version'), FORMAT_VERSION), file = sys.stderr)
+            return 2
+
+    solar.get_season_table()
+    (suite, uncovered) = benchmarks(args.quick)
+    results = {}
+    for (name, fun, evals) in suite:
+        if args.filter not in name:
+            continue
+        result = {'calls_per_second' : measure(fun, args.min_time, args.repeat)}
+        line = '%-56s %14.6g calls/s' % (name, result['calls_per_second'])
+        n = None if evals is None else evals()
+        if n is not None:
+            result['evaluations'] = n
+            line += ' %8.2f evaluations/prediction' % n
+        results[name] = result
+        print(line, flush = True)
+
+    status = 0
+    for name in uncovered:
+        print('UNCOVERED: %s' % name, file = sys.stderr)
+        status = 1
+    if baseline is not None:
+        regressions = compare(results, baseline['results'], args.threshold)
+        for regression in regressions:
+            print('REGRESSION: %s' % regression, file = sys.stderr)
+        status = 1 if regressions else status
+    if args.save is not None:
+        with open(args.save, 'w') as file:
+            json.dump({'version' : FORMAT_VERSION,
+                       'python' : sys.version.split()[0],
+                       'results' : results}, file, indent = 2, sort_keys = True)
+            file.write('\n')
+    return status
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
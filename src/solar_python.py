@@ -104,6 +104,89 @@ SOLAR_ELEVATION_RANGE_BLUE_HOUR = (-6.0, -4.0)
 '''
 
 
+DAILY_EVENT_ELEVATIONS = (SOLAR_ELEVATION_RANGE_GOLDEN_HOUR[1],
+                          SOLAR_ELEVATION_PRESUNSET_POSTSUNRISE,
+                          SOLAR_ELEVATION_RANGE_TWILIGHT[1],
+                          SOLAR_ELEVATION_SUNSET_SUNRISE,
+                          SOLAR_ELEVATION_RANGE_GOLDEN_HOUR[0],
+                          SOLAR_ELEVATION_CIVIL_DUSK_DAWN,
+                          SOLAR_ELEVATION_NAUTICAL_DUSK_DAWN,
+                          SOLAR_ELEVATION_AMATEUR_ASTRONOMICAL_DUSK_DAWN,
+                          SOLAR_ELEVATION_ASTRONOMICAL_DUSK_DAWN)
+'''
+:tuple<float>  Every elevation, in degrees, in the `SOLAR_ELEVATION_*`
+               and `SOLAR_ELEVATION_RANGE_*` constants, in descending
+               order; these are the elevations `daily_events` calculates
+               the times of
+'''
+
+
+PREDICTION_TOLERANCE = 0.001 / 86400 / 36525
+'''
+:float  The default time tolerance of the prediction functions,
+        one millisecond measured in Julian Centuries
+'''
+
+
+FAST_PREDICTION_TOLERANCE = 0.1 / 86400 / 36525
+'''
+:float  The time tolerance of the prediction functions with `precision = 'fast'`,
+        a tenth of a second measured in Julian Centuries
+'''
+
+
+FAST_ELEVATION_ERROR = 0.02
+'''
+:float  The maximum error, in degrees, of the Sun's elevation calculated
+        with `precision = 'fast'` between the years 1900 and 2100
+'''
+
+
+FAST_TIME_ERROR = 5 / 86400 / 36525
+'''
+:float  The maximum error, in Julian Centuries, of the times of the Sun's
+        elevations predicted with `precision = 'fast'` between the years
+        1900 and 2100 within 45 degrees of the equator, five seconds;
+        it grows to half a minute at the polar circles, and without
+        bound where the Sun barely reaches the elevation
+'''
+
+
+FAST_SEASON_ERROR = 20 / 1440 / 36525
+'''
+:float  The maximum error, in Julian Centuries, of the times of the
+        equinoxes and solstices predicted with `precision = 'fast'`
+        between the years 1900 and 2100, twenty minutes
+'''
+
+
+SUNRISE_EQUATION_ERROR = 20 / 86400 / 36525
+'''
+:float  The maximum error, in Julian Centuries, of the times calculated by
+        `sunrise_equation` between the years 1900 and 2100 within 65 degrees
+        of the equator, except where the Sun barely reaches the elevation,
+        twenty seconds
+'''
+
+
+TIME_ABOVE_ELEVATION_ERROR = 15 / 3600
+'''
+:float  The maximum error, in hours, of the times calculated by
+        `time_above_elevation` and `time_above_elevation_array`
+        between the years 1900 and 2100, fifteen seconds, measured
+        against the rising and setting found with Brent's method
+'''
+
+
+SERIES_ELEVATION_ERROR = 0.0001
+'''
+:float  The maximum error, in degrees, of the Sun's elevation calculated
+        with `solar_elevation_series` and `solar_elevation_series_array`
+        when refreshing at least every six hours, about 0.0009 degrees
+        when refreshing once a day
+'''
+
+
 
 # The following functions are used to calculate the result for `sun`
 # (most of them) but could be used for anything else. There name is
@@ -334,6 +417,171 @@ def corrected_mean_ecliptic_obliquity(t):
     return radians(rc)
 
 
+class SolarState(object):
+    '''
+    The Sun's ephemeris at a point in time, as calculated by `solar_state`
+    
+    @variable  mean_longitude:float      The Sun's geometric mean longitude,
+                                         in radians
+    @variable  mean_anomaly:float        The Sun's geometric mean anomaly,
+                                         in radians
+    @variable  eccentricity:float        The Earth's orbit eccentricity
+    @variable  obliquity:float           The corrected mean ecliptic
+                                         obliquity, in radians
+    @variable  apparent_longitude:float  The Sun's apparent longitude,
+                                         in radians
+    @variable  declination:float         The Sun's declination, in radians
+    @variable  equation_of_time:float    The equation of time, in degrees
+    '''
+    __slots__ = ('mean_longitude', 'mean_anomaly', 'eccentricity', 'obliquity',
+                 'apparent_longitude', 'declination', 'equation_of_time')
+    
+    def __init__(self, mean_longitude, mean_anomaly, eccentricity, obliquity,
+                 apparent_longitude, declination, equation_of_time):
+        self.mean_longitude = mean_longitude
+        self.mean_anomaly = mean_anomaly
+        self.eccentricity = eccentricity
+        self.obliquity = obliquity
+        self.apparent_longitude = apparent_longitude
+        self.declination = declination
+        self.equation_of_time = equation_of_time
+    
+    def __repr__(self):
+        return 'SolarState(%s)' % ', '.join('%s=%r' % (k, getattr(self, k)) for k in self.__slots__)
+
+
+def solar_state_from(t, sin, cos, tan, asin):
+    '''
+    Calculates the Sun's ephemeris with the specified trigonometric
+    functions, computing each subexpression exactly once; this is
+    the kernel behind `solar_state` and `solar_state_array`
+    
+    @param   t:float             The time in Julian Centuries
+    @param   sin:(float)→float   The sine function to use
+    @param   cos:(float)→float   The cosine function to use
+    @param   tan:(float)→float   The tangent function to use
+    @param   asin:(float)→float  The arcsine function to use
+    @return  :SolarState         The Sun's ephemeris
+    '''
+    d2r = 0.017453292519943295 # math.pi / 180
+    tt = t * t
+    l = ((0.0003032 * tt + 36000.76983 * t + 280.46646) % 360) * d2r
+    m = (-0.0001537 * tt + 35999.05029 * t + 357.52911) * d2r
+    e = -0.0000001267 * tt - 0.000042037 * t + 0.016708634
+    sin_m, sin_2m = sin(m), sin(2 * m)
+    c = sin_m * (-0.000014 * tt - 0.004817 * t + 1.914602)
+    c += sin_2m * (-0.000101 * t + 0.019993)
+    c += sin(3 * m) * 0.000289
+    o = (-1934.136 * t + 125.04) * d2r
+    a = (l / d2r + c - 0.00569 - 0.00478 * sin(o)) * d2r
+    y = 0.001813 * tt * t - 0.00059 * tt - 46.815 * t + 21.448
+    y = (23 + (26 + y / 60) / 60 + 0.00256 * cos(o)) * d2r
+    d = asin(sin(y) * sin(a))
+    z = tan(y / 2) ** 2
+    rc = z * sin(2 * l)
+    rc += (4 * z * cos(2 * l) - 2) * e * sin_m
+    rc -= 0.5 * z * z * sin(4 * l)
+    rc -= 1.25 * e * e * sin_2m
+    return SolarState(l, m, e, y, a, d, 4 * rc / d2r)
+
+
+def solar_state(t):
+    '''
+    Calculates the Sun's geometric mean longitude and anomaly, the Earth's
+    orbit eccentricity, the corrected mean ecliptic obliquity, the Sun's
+    apparent longitude, the Sun's declination and the equation of time
+    in one pass
+    
+    @param   t:float      The time in Julian Centuries
+    @return  :SolarState  The Sun's ephemeris
+    '''
+    import math
+    return solar_state_from(t, math.sin, math.cos, math.tan, math.asin)
+
+
+def solar_state_derivative_from(t, state, sin, cos, tan):
+    '''
+    Calculates the derivatives, with respect to time, of the Sun's
+    ephemeris with the specified trigonometric functions; this is
+    the kernel behind `solar_state_derivative`
+    
+    @param   t:float            The time in Julian Centuries
+    @param   state:SolarState   The Sun's ephemeris at `t`
+    @param   sin:(float)→float  The sine function to use
+    @param   cos:(float)→float  The cosine function to use
+    @param   tan:(float)→float  The tangent function to use
+    @return  :SolarState        The derivatives of the Sun's ephemeris,
+                                per Julian Century
+    '''
+    d2r = 0.017453292519943295 # math.pi / 180
+    tt = t * t
+    l, m, e = state.mean_longitude, state.mean_anomaly, state.eccentricity
+    y, a, d = state.obliquity, state.apparent_longitude, state.declination
+    dl = (0.0006064 * t + 36000.76983) * d2r
+    dm = (-0.0003074 * t + 35999.05029) * d2r
+    de = -0.0000002534 * t - 0.000042037
+    sin_m, cos_m, sin_2m, cos_2m = sin(m), cos(m), sin(2 * m), cos(2 * m)
+    dc = cos_m * dm * (-0.000014 * tt - 0.004817 * t + 1.914602) + sin_m * (-0.000028 * t - 0.004817)
+    dc += 2 * cos_2m * dm * (-0.000101 * t + 0.019993) - sin_2m * 0.000101
+    dc += 3 * cos(3 * m) * dm * 0.000289
+    o, do = (-1934.136 * t + 125.04) * d2r, -1934.136 * d2r
+    da = dl + (dc - 0.00478 * cos(o) * do) * d2r
+    dy = ((0.005439 * tt - 0.00118 * t - 46.815) / 3600 - 0.00256 * sin(o) * do) * d2r
+    dd = (cos(y) * sin(a) * dy + sin(y) * cos(a) * da) / cos(d)
+    k = tan(y / 2)
+    z, dz = k * k, k * (1 + k * k) * dy
+    sin_2l, cos_2l = sin(2 * l), cos(2 * l)
+    rc = dz * sin_2l + 2 * z * cos_2l * dl
+    rc += (4 * dz * cos_2l - 8 * z * sin_2l * dl) * e * sin_m
+    rc += (4 * z * cos_2l - 2) * (de * sin_m + e * cos_m * dm)
+    rc -= z * dz * sin(4 * l) + 2 * z * z * cos(4 * l) * dl
+    rc -= 2.5 * e * de * sin_2m + 2.5 * e * e * cos_2m * dm
+    return SolarState(dl, dm, de, dy, da, dd, 4 * rc / d2r)
+
+
+def solar_state_derivative(t):
+    '''
+    Calculates the derivatives, with respect to time, of the Sun's
+    ephemeris, as calculated by `solar_state`, in closed form
+    
+    @param   t:float      The time in Julian Centuries
+    @return  :SolarState  The derivatives of the Sun's ephemeris, per
+                          Julian Century; the attributes have the same
+                          units as for `solar_state` per Julian Century
+    '''
+    import math
+    state = solar_state_from(t, math.sin, math.cos, math.tan, math.asin)
+    return solar_state_derivative_from(t, state, math.sin, math.cos, math.tan)
+
+
+ephemeris_table = None
+'''
+:ChebyshevEphemeris|EphemerisCache?  The table, installed with `use_ephemeris`,
+                                     that `solar_ephemeris` looks up the Sun's
+                                     declination and the equation of time in,
+                                     `None` to always calculate them with
+                                     `solar_state`
+'''
+
+
+def solar_ephemeris(t):
+    '''
+    Calculates the Sun's declination and the equation of time, from
+    the installed ephemeris table if it covers the time and otherwise
+    with `solar_state`
+    
+    @param   t:float          The time in Julian Centuries
+    @return  :(float, float)  The Sun's declination, in radians,
+                              and the equation of time, in degrees
+    '''
+    if ephemeris_table is not None:
+        rc = ephemeris_table.lookup(t)
+        if rc is not None:
+            return rc
+    rc = solar_state(t)
+    return (rc.declination, rc.equation_of_time)
+
+
 def solar_declination(t):
     '''
     Calculates the Sun's declination
@@ -341,10 +589,7 @@ def solar_declination(t):
     @param   t:float  The time in Julian Centuries
     @return  :float   The Sun's declination, in radians
     '''
-    import math
-    rc = math.sin(corrected_mean_ecliptic_obliquity(t))
-    rc *= math.sin(sun_apparent_longitude(t))
-    return math.asin(rc)
+    return solar_ephemeris(t)[0]
 
 
 def equation_of_time(t):
@@ -355,37 +600,50 @@ def equation_of_time(t):
     @param   t:float  The time in Julian Centuries
     @return  :float   The equation of time, in degrees
     '''
-    import math
-    l = sun_geometric_mean_longitude(t)
-    e = earth_orbit_eccentricity(t)
-    m = sun_geometric_mean_anomaly(t)
-    y = corrected_mean_ecliptic_obliquity(t)
-    y = math.tan(y / 2) ** 2
-    rc = y * math.sin(2 * l)
-    rc += (4 * y * math.cos(2 * l) - 2) * e * math.sin(m)
-    rc -= 0.5 * y ** 2 * math.sin(4 * l)
-    rc -= 1.25 * e ** 2 * math.sin(2 * m)
-    return 4 * degrees(rc)
+    return solar_ephemeris(t)[1]
+
+
+def solar_declination_derivative(t):
+    '''
+    Calculates the derivative, with respect to time, of the Sun's declination
+    
+    @param   t:float  The time in Julian Centuries
+    @return  :float   The derivative of the Sun's declination,
+                      in radians per Julian Century
+    '''
+    return solar_state_derivative(t).declination
+
+
+def equation_of_time_derivative(t):
+    '''
+    Calculates the derivative, with respect to time, of the equation of time
+    
+    @param   t:float  The time in Julian Centuries
+    @return  :float   The derivative of the equation of
+                      time, in degrees per Julian Century
+    '''
+    return solar_state_derivative(t).equation_of_time
 
 
 def hour_angle_from_elevation(latitude, declination, elevation):
     '''
     Calculates the solar hour angle from the Sun's elevation
     
-    @param   longitude:float    The longitude in degrees eastwards
-                                from Greenwich, negative for westwards
+    @param   latitude:float     The latitude in degrees northwards from
+                                the equator, negative for southwards
     @param   declination:float  The declination, in radians
     @param   elevation:float    The Sun's elevation, in radians
-    @return  :float             The solar hour angle, in radians
+    @return  :float             The solar hour angle, in radians, of the
+                                time before the solar noon the Sun has
+                                the elevation; negate it for the time
+                                after the solar noon
+    @throws  ValueError         If the Sun does not reach the elevation
     '''
     import math
-    if elevation == 0:
-        return 0
-    rc = math.cos(abs(elevation))
+    rc = math.sin(elevation)
     rc -= math.sin(radians(latitude)) * math.sin(declination)
     rc /= math.cos(radians(latitude)) * math.cos(declination)
-    rc = math.acos(rc)
-    return -rc if (rc < 0) == (elevation < 0) else rc
+    return math.acos(rc)
 
 
 def elevation_from_hour_angle(latitude, declination, hour_angle):
@@ -416,11 +674,12 @@ def time_of_solar_noon(t, longitude):
     @return  :float           The time, in Julian Centuries,
                               of the closest solar noon
     '''
-    t, rc = julian_centuries_to_julian_day(t), longitude
-    for (k, m) in ((-360, 0), (1440, -0.5)):
-        rc = julian_day_to_julian_centuries(t + m + rc / k)
-        rc = 720 - 4 * longitude - equation_of_time(rc)
-    return rc
+    t = julian_centuries_to_julian_day(t) + longitude / 360
+    t = float(int(t + 0.5)) - longitude / 360
+    rc = t
+    for _itr in range(2):
+        rc = t - equation_of_time(julian_day_to_julian_centuries(rc)) / 1440
+    return julian_day_to_julian_centuries(rc)
 
 
 def time_of_solar_elevation(t, noon, latitude, longitude, elevation):
@@ -428,8 +687,10 @@ def time_of_solar_elevation(t, noon, latitude, longitude, elevation):
     Calculates the time the Sun has a specified apparent
     elevation at a geographical position
     
-    @param   t:float          A time close to the sought time,
-                              in Julian Centuries
+    @param   t:float          A time close to the sought time, in Julian
+                              Centuries, the time before the solar noon
+                              is calculated if it is before `noon`, and
+                              the time after the solar noon otherwise
     @param   noon:float       The time of the closest solar noon
     @param   latitude:float   The latitude in degrees northwards from
                               the equator, negative for southwards
@@ -438,19 +699,37 @@ def time_of_solar_elevation(t, noon, latitude, longitude, elevation):
     @param   elevation:float  The solar elevation, in radians
     @return  :float           The time, in Julian Centuries,
                               of the specified elevation
+    @throws  ValueError       If the Sun does not reach the elevation
     '''
+    import math
+    k = (1 if t < noon else -1) / (2 * math.pi) / 36525
+    t = julian_centuries_to_julian_day(noon) + longitude / 360
+    t = julian_day_to_julian_centuries(float(int(t + 0.5)) - longitude / 360)
     rc = noon
-    rc, et = solar_declination(rc), equation_of_time(rc)
-    rc = hour_angle_from_elevation(latitude, rc, elevation)
-    rc = 720 - 4 * (longitude + degrees(rc)) - et
-    
-    rc = julian_day_to_julian_centuries(julian_centuries_to_julian_day(t) + rc / 1440)
-    rc, et = solar_declination(rc), equation_of_time(rc)
-    rc = hour_angle_from_elevation(latitude, rc, elevation)
-    rc = 720 - 4 * (longitude + degrees(rc)) - et
+    for _itr in range(2):
+        rc, et = solar_ephemeris(rc)
+        rc = hour_angle_from_elevation(latitude, rc, elevation)
+        rc = t - et / 1440 / 36525 - k * rc
     return rc
 
 
+def solar_hour_angle_from(t, longitude, equation_of_time, trunc):
+    '''
+    Calculates the Sun's hour angle with the specified truncation
+    function; this is the kernel behind every function that calculates
+    the Sun's elevation or azimuth from the equation of time
+    
+    @param   t:float                 The time in Julian Centuries
+    @param   longitude:float         The longitude in degrees eastwards from
+                                     Greenwich, negative for westwards
+    @param   equation_of_time:float  The equation of time, as `equation_of_time`
+    @param   trunc:(float)→float     The function to use to round towards zero
+    @return  :float                  The Sun's hour angle, in degrees
+    '''
+    h = julian_centuries_to_julian_day(t)
+    return (720 - (h - trunc(h + 0.5) - 0.5) * 1440 - equation_of_time) / 4 - longitude
+
+
 def solar_elevation_from_time(t, latitude, longitude):
     '''
     Calculates the Sun's elevation as apparent
@@ -465,14 +744,13 @@ def solar_elevation_from_time(t, latitude, longitude):
                               time as seen from the specified position,
                               measured in radians
     '''
-    rc = julian_centuries_to_julian_day(t)
-    rc = (rc - float(int(rc + 0.5)) - 0.5) * 1440
-    rc = 720 - rc - equation_of_time(t)
-    rc = radians(rc / 4 - longitude)
-    return elevation_from_hour_angle(latitude, solar_declination(t), rc)
+    import math
+    d, et = solar_ephemeris(t)
+    rc = radians(solar_hour_angle_from(t, longitude, et, math.trunc))
+    return elevation_from_hour_angle(latitude, d, rc)
 
 
-def solar_elevation(latitude, longitude, t = None):
+def solar_elevation(latitude, longitude, t = None, precision = 'default'):
     '''
     Calculates the Sun's elevation as apparent
     from a geographical position
@@ -483,15 +761,297 @@ def solar_elevation(latitude, longitude, t = None):
                               Greenwich, negative for westwards
     @param   t:float?         The time in Julian Centuries, `None`
                               for the current time
+    @param   precision:str    'fast' to use `solar_elevation_fast`
     @return  :float           The Sun's apparent elevation at the specified
                               time as seen from the specified position,
                               measured in degrees
     '''
     rc = julian_centuries() if t is None else t
+    if fast_precision(precision):
+        return solar_elevation_fast(latitude, longitude, rc)
     rc = solar_elevation_from_time(rc, latitude, longitude)
     return degrees(rc)
 
 
+def azimuth_from_hour_angle(latitude, declination, hour_angle):
+    '''
+    Calculates the Sun's azimuth from the solar hour angle
+    
+    @param   latitude:float     The latitude in degrees northwards from
+                                the equator, negative for southwards
+    @param   declination:float  The declination, in radians
+    @param   hour_angle:float   The solar hour angle, in radians, positive
+                                before the solar noon, as returned by
+                                `hour_angle_from_elevation`
+    @return  :float             The Sun's azimuth, in radians clockwise
+                                from north, from 0 up to but excluding 2π
+    '''
+    import math
+    cos_d = math.cos(declination)
+    rc = math.cos(radians(latitude)) * math.sin(declination)
+    rc -= math.sin(radians(latitude)) * cos_d * math.cos(hour_angle)
+    return math.atan2(math.sin(hour_angle) * cos_d, rc) % (2 * math.pi)
+
+
+def solar_position_from_time(t, latitude, longitude, precision = 'default'):
+    '''
+    Calculates the Sun's elevation and azimuth as apparent
+    from a geographical position
+    
+    @param   t:float          The time in Julian Centuries
+    @param   latitude:float   The latitude in degrees northwards from
+                              the equator, negative for southwards
+    @param   longitude:float  The longitude in degrees eastwards from
+                              Greenwich, negative for westwards
+    @param   precision:str    'fast' to use `solar_ephemeris_fast`
+    @return  :(float, float)  The Sun's apparent elevation, and its azimuth
+                              clockwise from north, at the specified time
+                              as seen from the specified position,
+                              measured in radians
+    '''
+    import math
+    d, et = (solar_ephemeris_fast if fast_precision(precision) else solar_ephemeris)(t)
+    rc = radians(solar_hour_angle_from(t, longitude, et, math.trunc))
+    return (elevation_from_hour_angle(latitude, d, rc), azimuth_from_hour_angle(latitude, d, rc))
+
+
+def solar_position(latitude, longitude, t = None, precision = 'default'):
+    '''
+    Calculates the Sun's elevation and azimuth as apparent from a
+    geographical position, from a single evaluation of the ephemeris
+    
+    @param   latitude:float   The latitude in degrees northwards from
+                              the equator, negative for southwards
+    @param   longitude:float  The longitude in degrees eastwards from
+                              Greenwich, negative for westwards
+    @param   t:float?         The time in Julian Centuries, `None`
+                              for the current time
+    @param   precision:str    'fast' to use `solar_ephemeris_fast`
+    @return  :(float, float)  The Sun's apparent elevation, and its azimuth
+                              clockwise from north, at the specified time
+                              as seen from the specified position,
+                              measured in degrees
+    '''
+    rc = julian_centuries() if t is None else t
+    rc = solar_position_from_time(rc, latitude, longitude, precision)
+    return (degrees(rc[0]), degrees(rc[1]))
+
+
+def solar_azimuth(latitude, longitude, t = None, precision = 'default'):
+    '''
+    Calculates the Sun's azimuth as apparent
+    from a geographical position
+    
+    @param   latitude:float   The latitude in degrees northwards from
+                              the equator, negative for southwards
+    @param   longitude:float  The longitude in degrees eastwards from
+                              Greenwich, negative for westwards
+    @param   t:float?         The time in Julian Centuries, `None`
+                              for the current time
+    @param   precision:str    'fast' to use `solar_ephemeris_fast`
+    @return  :float           The Sun's azimuth, clockwise from north,
+                              at the specified time as seen from the
+                              specified position, measured in degrees
+    '''
+    return solar_position(latitude, longitude, t, precision)[1]
+
+
+def solar_hour_angle_derivative(t):
+    '''
+    Calculates the derivative, with respect to time, of the solar
+    hour angle, which is independent of the geographical position
+    
+    @param   t:float  The time in Julian Centuries
+    @return  :float   The derivative of the solar hour angle,
+                      in radians per Julian Century
+    '''
+    return radians((-1440 * 36525 - equation_of_time_derivative(t)) / 4)
+
+
+def solar_elevation_derivative(latitude, longitude, t = None):
+    '''
+    Calculates the derivative, with respect to time, of the Sun's
+    elevation as apparent from a geographical position
+    
+    @param   latitude:float   The latitude in degrees northwards from
+                              the equator, negative for southwards
+    @param   longitude:float  The longitude in degrees eastwards from
+                              Greenwich, negative for westwards
+    @param   t:float?         The time in Julian Centuries, `None`
+                              for the current time
+    @return  :float           The derivative of the Sun's apparent elevation
+                              at the specified time as seen from the specified
+                              position, measured in degrees per Julian Century
+    '''
+    import math
+    t = julian_centuries() if t is None else t
+    state = solar_state_from(t, math.sin, math.cos, math.tan, math.asin)
+    dstate = solar_state_derivative_from(t, state, math.sin, math.cos, math.tan)
+    d, dd = state.declination, dstate.declination
+    h = radians(solar_hour_angle_from(t, longitude, state.equation_of_time, math.trunc))
+    dh = radians((-1440 * 36525 - dstate.equation_of_time) / 4)
+    latitude = radians(latitude)
+    rc = math.cos(latitude) * math.cos(h) * math.cos(d) + math.sin(latitude) * math.sin(d)
+    drc = -math.cos(latitude) * (math.sin(h) * dh * math.cos(d) + math.cos(h) * math.sin(d) * dd)
+    drc += math.sin(latitude) * math.cos(d) * dd
+    return degrees(drc / math.sqrt(1 - rc * rc))
+
+
+
+# The following functions are the low-precision tier, selected with
+# `precision = 'fast'`. They use the Astronomical Almanac's low-precision
+# solar coordinates: no nutation, aberration or higher order terms of
+# the equation of centre, a linear obliquity, and the equation of time
+# as a short series in the Sun's longitude and mean anomaly.
+
+def fast_precision(precision):
+    '''
+    Check which precision tier is selected
+    
+    @param   precision:str  'default' for the full series,
+                            'fast' for the low-precision tier
+    @return  :bool          Whether the low-precision tier is selected
+    @throws  ValueError     If the tier is unknown
+    '''
+    if precision == 'fast':
+        return True
+    if precision == 'default':
+        return False
+    raise ValueError('unknown precision: %r' % (precision,))
+
+
+def solar_ephemeris_fast_from(t, sin, cos):
+    '''
+    Calculates the terms of the low-precision solar coordinates with
+    the specified trigonometric functions; this is the kernel behind
+    every function of the low-precision tier and `sunrise_equation_from`
+    
+    @param   t:float            The time in Julian Centuries
+    @param   sin:(float)→float  The sine function to use
+    @param   cos:(float)→float  The cosine function to use
+    @return  :(float, float, float, float, float, float)  The sine and cosine of the Sun's mean
+                                                          anomaly, the sine and cosine of the
+                                                          Sun's ecliptic longitude, the sine of
+                                                          the obliquity of the ecliptic, and the
+                                                          equation of time, in degrees
+    '''
+    d2r = 0.017453292519943295 # math.pi / 180
+    g = (35999.050 * t + 357.528) * d2r
+    sin_g, cos_g = sin(g), cos(g)
+    sin_2g = 2 * sin_g * cos_g
+    l = (36000.770 * t + 280.460 + 1.915 * sin_g + 0.020 * sin_2g) * d2r
+    sin_l, cos_l = sin(l), cos(l)
+    sin_2l = 2 * sin_l * cos_l
+    et = 2.466 * sin_2l - 0.106 * sin_2l * (cos_l * cos_l - sin_l * sin_l) - 1.915 * sin_g - 0.020 * sin_2g
+    return (sin_g, cos_g, sin_l, cos_l, 0.397777 - 0.000208 * t, et)
+
+
+def solar_ephemeris_fast(t):
+    '''
+    Calculates the Sun's declination and the equation of time with
+    low precision, the errors are below 0.005 degrees and 0.07 minutes
+    of time, respectively, between the years 1900 and 2100
+    
+    @param   t:float          The time in Julian Centuries
+    @return  :(float, float)  The Sun's declination, in radians, and the
+                              equation of time, as `equation_of_time`
+    '''
+    import math
+    _sin_g, _cos_g, sin_l, _cos_l, sin_e, et = solar_ephemeris_fast_from(t, math.sin, math.cos)
+    return (math.asin(sin_e * sin_l), 4 * et)
+
+
+def solar_declination_derivative_fast(t):
+    '''
+    Calculates the derivative, with respect to time,
+    of the Sun's declination with low precision
+    
+    @param   t:float  The time in Julian Centuries
+    @return  :float   The derivative of the Sun's declination,
+                      in radians per Julian Century
+    '''
+    import math
+    d2r = 0.017453292519943295 # math.pi / 180
+    sin_g, cos_g, sin_l, cos_l, sin_e, _et = solar_ephemeris_fast_from(t, math.sin, math.cos)
+    dl = (36000.770 + 35999.050 * d2r * (1.915 * cos_g + 0.040 * (cos_g * cos_g - sin_g * sin_g))) * d2r
+    sin_d = sin_e * sin_l
+    return sin_e * cos_l * dl / math.sqrt(1 - sin_d * sin_d)
+
+
+def solar_elevation_fast(latitude, longitude, t):
+    '''
+    Calculates the Sun's elevation as apparent from a geographical
+    position with low precision, the error is below `FAST_ELEVATION_ERROR`
+    
+    @param   latitude:float   The latitude in degrees northwards from
+                              the equator, negative for southwards
+    @param   longitude:float  The longitude in degrees eastwards from
+                              Greenwich, negative for westwards
+    @param   t:float          The time in Julian Centuries
+    @return  :float           The Sun's apparent elevation at the specified
+                              time as seen from the specified position,
+                              measured in degrees
+    '''
+    import math
+    latitude = radians(latitude)
+    return solar_elevation_fast_from(math.sin(latitude), math.cos(latitude), longitude, t)
+
+
+def solar_elevation_fast_from(sin_latitude, cos_latitude, longitude, t):
+    '''
+    Calculates the Sun's elevation with low precision, like
+    `solar_elevation_fast`, from the sine and cosine of the
+    latitude; this is the kernel behind `solar_elevation_fast`
+    and `Observer.elevation`
+    
+    @param   sin_latitude:float  The sine of the latitude
+    @param   cos_latitude:float  The cosine of the latitude
+    @param   longitude:float     The longitude in degrees eastwards from
+                                 Greenwich, negative for westwards
+    @param   t:float             The time in Julian Centuries
+    @return  :float              The Sun's apparent elevation at the specified
+                                 time as seen from the specified position,
+                                 measured in degrees
+    '''
+    import math
+    d2r = 0.017453292519943295 # math.pi / 180
+    _sin_g, _cos_g, sin_l, _cos_l, sin_e, et = solar_ephemeris_fast_from(t, math.sin, math.cos)
+    sin_d = sin_e * sin_l
+    h = solar_hour_angle_from(t, longitude, 4 * et, math.trunc)
+    rc = cos_latitude * math.sqrt(1 - sin_d * sin_d) * math.cos(h * d2r)
+    rc += sin_latitude * sin_d
+    return math.asin(rc) / d2r
+
+
+def solar_elevation_derivative_fast(latitude, longitude, t):
+    '''
+    Calculates the derivative, with respect to time, of the Sun's
+    elevation as apparent from a geographical position with low precision
+    
+    @param   latitude:float   The latitude in degrees northwards from
+                              the equator, negative for southwards
+    @param   longitude:float  The longitude in degrees eastwards from
+                              Greenwich, negative for westwards
+    @param   t:float          The time in Julian Centuries
+    @return  :float           The derivative of the Sun's apparent elevation
+                              at the specified time as seen from the specified
+                              position, measured in degrees per Julian Century
+    '''
+    import math
+    d2r = 0.017453292519943295 # math.pi / 180
+    _sin_g, _cos_g, sin_l, cos_l, sin_e, et = solar_ephemeris_fast_from(t, math.sin, math.cos)
+    sin_d = sin_e * sin_l
+    cos_d = math.sqrt(1 - sin_d * sin_d)
+    dd = sin_e * cos_l * 36000.770 * d2r / cos_d
+    h = solar_hour_angle_from(t, longitude, 4 * et, math.trunc) * d2r
+    dh = -360 * 36525 * d2r
+    sin_p, cos_p = math.sin(latitude * d2r), math.cos(latitude * d2r)
+    rc = cos_p * math.cos(h) * cos_d + sin_p * sin_d
+    drc = -cos_p * (math.sin(h) * dh * cos_d + math.cos(h) * sin_d * dd)
+    drc += sin_p * cos_d * dd
+    return drc / math.sqrt(1 - rc * rc) / d2r
+
+
 
 def have_sunrise_and_sunset(latitude, t = None):
     '''
@@ -550,147 +1110,2587 @@ def is_winter(latitude, t = None):
     return not ((d > 0) == (latitude > 0))
 
 
+def polar_periods(latitude, year):
+    '''
+    Predict the periods of polar day and polar night around the solstices
+    of a year, when the Sun's declination is so that there are no sunrises
+    and sunsets, see `have_sunrise_and_sunset`; the boundaries, where the
+    absolute declination is `90 - abs(latitude)` degrees, are found with
+    `solar_prediction_brent` searching outwards from the solstices
+    
+    @param   latitude:float  The latitude in degrees northwards from
+                             the equator, negative for southwards
+    @param   year:int        The year, in the Gregorian calendar
+    @return  :(float?, float?, float?, float?)  The beginning and end of the polar day around
+                                                the local summer solstice, and of the polar
+                                                night around the local winter solstice, in
+                                                Julian Centuries, `None` if there is no polar
+                                                day or polar night; the polar night in the
+                                                northern hemisphere ends the following year
+    '''
+    import calendar
+    t = epoch_to_julian_centuries(calendar.timegm((year, 1, 1, 0, 0, 0)))
+    june = future_solstice(t)
+    december = future_solstice(june + 1 / 36525)
+    threshold = radians(90 - abs(latitude))
+    rc = []
+    for solstice in ((june, december) if latitude >= 0 else (december, june)):
+        requested = threshold if solstice == june else -threshold
+        if abs(solar_declination(solstice)) <= threshold:
+            rc.extend((None, None))
+            continue
+        for delta in (-0.001, 0.001):
+            rc.append(solar_prediction_brent(delta, requested, solar_declination, t = solstice, span = 0.006)[0])
+    return tuple(rc)
+
 
-def solar_prediction(delta, requested, fun, epsilon = 0.000001, span = 0.01, t = None):
+def time_above_elevation(latitude, longitude, elevation, t = None):
     '''
-    Predict the time point of the next or previous
-    time an arbitrary condition is meet
+    Calculates how long the Sun is above an elevation during a day, for
+    example the length of the daylight; the time within a band of
+    elevations, such as a twilight, is the difference between the
+    times above its edges
     
-    @param   delta:float          Iteration step size, negative for past
-                                  event, positive for future event
-    @param   requested:float      The value returned by `fun` for which to
-                                  calculate the time point of occurrence
-    @param   fun:(t:float)→float  Function that calculate the data of interest
-    @param   epsilon:float        The tolerance for the result
-    @param   span:float           The number of Julian Centuries (0,01 for
-                                  one year) to restrict the search to
-    @param   t:float?             The time in Julian Centuries, `None` for
-                                  the current time
-    @return  :float?              The calculated time point, `None` if none
-                                  were found within the specified time span
+    The length is derived from the hour angle of the elevation with the
+    Sun's declination at the day's local mean noon, and the rate of the
+    hour angle there; the change in the declination between the morning
+    and the evening cancels out to first order. Where the hour angle
+    is too sensitive to the declination for this, close to where the
+    Sun barely reaches the elevation, the rising and the setting are
+    instead found with `brent_bracketed` between the solar noon and the
+    solar midnights, so the error is below `TIME_ABOVE_ELEVATION_ERROR`
+    
+    @param   latitude:float   The latitude in degrees northwards from
+                              the equator, negative for southwards
+    @param   longitude:float  The longitude in degrees eastwards from
+                              Greenwich, negative for westwards
+    @param   elevation:float  The elevation, in degrees
+    @param   t:float?         A time during the day, in Julian Centuries,
+                              the day is centred around the closest local
+                              mean noon; `None` for the current time
+    @return  :float           The time, in hours, 24 during polar day
+                              and 0 during polar night
     '''
-    fun_ = lambda t : fun(t) - requested
+    import math
     t = julian_centuries() if t is None else t
-    t1 = t2 = t
-    v1 = v0 = fun_(t)
+    noon = julian_centuries_to_julian_day(t) + longitude / 360
+    noon = julian_day_to_julian_centuries(float(int(noon + 0.5)) - longitude / 360)
+    d = solar_declination(noon)
+    cos_lat = math.cos(radians(latitude))
+    p, q = math.sin(radians(latitude)) * math.sin(d), cos_lat * math.cos(d)
+    rc = (math.sin(radians(elevation)) - p) / q
     
-    # Predicate time point to within a small time span
-    while True:
-        if abs(t2 - t) > span:
-            return None
+    # Far from the tangent, the hour angle at the mean noon is accurate enough,
+    # and the Sun's declination changes by less than 0.25 degrees in half a day
+    if abs(rc) < 1 and cos_lat * math.sqrt(1 - rc * rc) > 0.2:
+        return math.acos(rc) * 24 / math.pi / (1 + equation_of_time_derivative(noon) / 1440 / 36525)
+    if elevation > degrees(math.asin(min(p + q, 1))) + 0.25:
+        return 0.0
+    if elevation < degrees(math.asin(max(p - q, -1))) - 0.25:
+        return 24.0
+    
+    # Otherwise find the crossings in each half of the day
+    noon = time_of_solar_noon(noon, longitude)
+    fun = lambda t : solar_elevation(latitude, longitude, t)
+    rc = 0.0
+    for (a, b) in ((noon - 0.5 / 36525, noon), (noon, noon + 0.5 / 36525)):
+        fa, fb = fun(a) - elevation, fun(b) - elevation
+        if (fa >= 0) == (fb >= 0):
+            rc += (b - a) if fb >= 0 else 0.0
+        else:
+            x = brent_bracketed(a, b, fa, fb, elevation, fun, FAST_PREDICTION_TOLERANCE)[0]
+            rc += (b - x) if fb >= 0 else (x - a)
+    return rc * 36525 * 24
+
+
+
+class DailyEvents(object):
+    '''
+    The times, in Julian Centuries, of a day's solar events at a
+    geographical position, as calculated by `daily_events`
+    
+    @variable  noon:float               The time of the solar noon
+    @variable  elevations:tuple<float>  The elevations, in degrees, the times
+                                        of which are stored in `rising` and
+                                        `setting`
+    @variable  rising:tuple<float?>     For each elevation, the time before the
+                                        solar noon the Sun reaches it, `None`
+                                        if the Sun does not cross it
+    @variable  setting:tuple<float?>    For each elevation, the time after the
+                                        solar noon the Sun reaches it, `None`
+                                        if the Sun does not cross it
+    @variable  polar_day:bool           Whether the Sun does not set this day
+    @variable  polar_night:bool         Whether the Sun does not rise this day
+    '''
+    __slots__ = ('noon', 'elevations', 'rising', 'setting', 'polar_day', 'polar_night')
+    
+    def __init__(self, noon, elevations, rising, setting, polar_day, polar_night):
+        self.noon = noon
+        self.elevations = elevations
+        self.rising = rising
+        self.setting = setting
+        self.polar_day = polar_day
+        self.polar_night = polar_night
+    
+    def __repr__(self):
+        return 'DailyEvents(%s)' % ', '.join('%s=%r' % (k, getattr(self, k)) for k in self.__slots__)
+    
+    def rise(self, elevation):
+        '''
+        Get the time before the solar noon the Sun reaches an elevation
+        
+        @param   elevation:float  The elevation, in degrees, must be
+                                  one of the elevations in `elevations`
+        @return  :float?          The time, `None` if not crossed
+        '''
+        return self.rising[self.elevations.index(elevation)]
+    
+    def set(self, elevation):
+        '''
+        Get the time after the solar noon the Sun reaches an elevation
+        
+        @param   elevation:float  The elevation, in degrees, must be
+                                  one of the elevations in `elevations`
+        @return  :float?          The time, `None` if not crossed
+        '''
+        return self.setting[self.elevations.index(elevation)]
+    
+    def morning(self, elevation_range):
+        '''
+        Get the beginning and end of a period in the morning
+        
+        @param   elevation_range:(float, float)  The lowest and highest elevation
+                                                 of the period, for example
+                                                 `SOLAR_ELEVATION_RANGE_BLUE_HOUR`
+        @return  :(float?, float?)               The times the period begins
+                                                 and ends, `None` if not crossed
+        '''
+        return (self.rise(elevation_range[0]), self.rise(elevation_range[1]))
+    
+    def evening(self, elevation_range):
+        '''
+        Get the beginning and end of a period in the evening
+        
+        @param   elevation_range:(float, float)  The lowest and highest elevation
+                                                 of the period, for example
+                                                 `SOLAR_ELEVATION_RANGE_BLUE_HOUR`
+        @return  :(float?, float?)               The times the period begins
+                                                 and ends, `None` if not crossed
+        '''
+        return (self.set(elevation_range[1]), self.set(elevation_range[0]))
+    
+    sunrise = property(lambda self : self.rise(SOLAR_ELEVATION_SUNSET_SUNRISE),
+                       doc = ''':float?  The time of sunrise''')
+    sunset = property(lambda self : self.set(SOLAR_ELEVATION_SUNSET_SUNRISE),
+                      doc = ''':float?  The time of sunset''')
+    civil_dawn = property(lambda self : self.rise(SOLAR_ELEVATION_CIVIL_DUSK_DAWN),
+                          doc = ''':float?  The time of civil dawn''')
+    civil_dusk = property(lambda self : self.set(SOLAR_ELEVATION_CIVIL_DUSK_DAWN),
+                          doc = ''':float?  The time of civil dusk''')
+    nautical_dawn = property(lambda self : self.rise(SOLAR_ELEVATION_NAUTICAL_DUSK_DAWN),
+                             doc = ''':float?  The time of nautical dawn''')
+    nautical_dusk = property(lambda self : self.set(SOLAR_ELEVATION_NAUTICAL_DUSK_DAWN),
+                             doc = ''':float?  The time of nautical dusk''')
+    amateur_astronomical_dawn = property(lambda self : self.rise(SOLAR_ELEVATION_AMATEUR_ASTRONOMICAL_DUSK_DAWN),
+                                         doc = ''':float?  The time of amateur astronomical dawn''')
+    amateur_astronomical_dusk = property(lambda self : self.set(SOLAR_ELEVATION_AMATEUR_ASTRONOMICAL_DUSK_DAWN),
+                                         doc = ''':float?  The time of amateur astronomical dusk''')
+    astronomical_dawn = property(lambda self : self.rise(SOLAR_ELEVATION_ASTRONOMICAL_DUSK_DAWN),
+                                 doc = ''':float?  The time of astronomical dawn''')
+    astronomical_dusk = property(lambda self : self.set(SOLAR_ELEVATION_ASTRONOMICAL_DUSK_DAWN),
+                                 doc = ''':float?  The time of astronomical dusk''')
+
+
+def daily_events(latitude, longitude, t = None, elevations = DAILY_EVENT_ELEVATIONS):
+    '''
+    Calculates the times of a day's solar events at a geographical position
+    
+    The solar noon is calculated once with `time_of_solar_noon`, and every
+    event is derived from the Sun's ephemeris and its derivative at the
+    solar noon, which is accurate to within a few seconds except when
+    the Sun barely crosses the elevation
+    
+    @param   latitude:float           The latitude in degrees northwards from
+                                      the equator, negative for southwards
+    @param   longitude:float          The longitude in degrees eastwards from
+                                      Greenwich, negative for westwards
+    @param   t:float?                 A time during the day, in Julian Centuries,
+                                      the day is centred around the closest solar
+                                      noon; `None` for the current time
+    @param   elevations:tuple<float>  The elevations, in degrees, to calculate
+                                      the times for
+    @return  :DailyEvents             The times of the day's solar events
+    '''
+    t = julian_centuries() if t is None else t
+    noon = time_of_solar_noon(t, longitude)
+    return daily_events_near_noon(latitude, longitude, noon, elevations)
+
+
+def daily_events_near_noon(latitude, longitude, noon, elevations = DAILY_EVENT_ELEVATIONS):
+    '''
+    Calculates the times of a day's solar events at a geographical
+    position from an approximate time of the solar noon
+    
+    This is `daily_events` without `time_of_solar_noon`; the Sun's
+    ephemeris and its derivative are calculated once, at `noon`,
+    and the solar noon is refined from them
+    
+    @param   latitude:float           The latitude in degrees northwards from
+                                      the equator, negative for southwards
+    @param   longitude:float          The longitude in degrees eastwards from
+                                      Greenwich, negative for westwards
+    @param   noon:float               A time, in Julian Centuries, within
+                                      a few minutes of the solar noon
+    @param   elevations:tuple<float>  The elevations, in degrees, to calculate
+                                      the times for
+    @return  :DailyEvents             The times of the day's solar events
+    '''
+    return Observer(latitude, longitude).daily_events_near_noon(noon, elevations)
+
+
+class Observer(object):
+    '''
+    A geographical position, with the sine and cosine of its latitude
+    calculated once, so that calculations for a fixed position only
+    do the work that depends on the time
+    
+    @variable  latitude:float      The latitude in degrees northwards from
+                                   the equator, negative for southwards
+    @variable  longitude:float     The longitude in degrees eastwards from
+                                   Greenwich, negative for westwards
+    @variable  sin_latitude:float  The sine of the latitude
+    @variable  cos_latitude:float  The cosine of the latitude
+    @variable  precision:str       The precision tier of the calculations
+                                   and predictions
+    '''
+    __slots__ = ('latitude', 'longitude', 'sin_latitude', 'cos_latitude', 'precision')
+    
+    def __init__(self, latitude, longitude, precision = 'default'):
+        '''
+        Constructor
+        
+        @param  latitude:float   The latitude in degrees northwards from
+                                 the equator, negative for southwards
+        @param  longitude:float  The longitude in degrees eastwards from
+                                 Greenwich, negative for westwards
+        @param  precision:str    'fast' for the low-precision tier
+        '''
+        import math
+        fast_precision(precision)
+        self.latitude, self.longitude, self.precision = latitude, longitude, precision
+        self.sin_latitude = math.sin(radians(latitude))
+        self.cos_latitude = math.cos(radians(latitude))
+    
+    def __repr__(self):
+        return 'Observer(%r, %r, %r)' % (self.latitude, self.longitude, self.precision)
+    
+    def hour_angle_from_elevation(self, declination, elevation):
+        '''
+        Calculates the solar hour angle from the Sun's elevation,
+        like `hour_angle_from_elevation`
+        
+        @param   declination:float  The declination, in radians
+        @param   elevation:float    The Sun's elevation, in radians
+        @return  :float             The solar hour angle, in radians, of the
+                                    time before the solar noon the Sun has
+                                    the elevation; negate it for the time
+                                    after the solar noon
+        @throws  ValueError         If the Sun does not reach the elevation
+        '''
+        import math
+        rc = math.sin(elevation) - self.sin_latitude * math.sin(declination)
+        return math.acos(rc / (self.cos_latitude * math.cos(declination)))
+    
+    def elevation_from_hour_angle(self, declination, hour_angle):
+        '''
+        Calculates the Sun's elevation from the solar hour
+        angle, like `elevation_from_hour_angle`
+        
+        @param   declination:float  The declination, in radians
+        @param   hour_angle:float   The solar hour angle, in radians
+        @return  :float             The Sun's elevation, in radians
+        '''
+        import math
+        rc = self.cos_latitude * math.cos(hour_angle) * math.cos(declination)
+        return math.asin(rc + self.sin_latitude * math.sin(declination))
+    
+    def elevation(self, t = None):
+        '''
+        Calculates the Sun's elevation, like `solar_elevation`
+        
+        @param   t:float?  The time in Julian Centuries, `None`
+                           for the current time
+        @return  :float    The Sun's apparent elevation, in degrees
+        '''
+        import math
+        t = julian_centuries() if t is None else t
+        if self.precision == 'fast':
+            return solar_elevation_fast_from(self.sin_latitude, self.cos_latitude, self.longitude, t)
+        d, et = solar_ephemeris(t)
+        h = radians(solar_hour_angle_from(t, self.longitude, et, math.trunc))
+        rc = self.cos_latitude * math.cos(h) * math.cos(d)
+        return degrees(math.asin(rc + self.sin_latitude * math.sin(d)))
+    
+    def elevation_derivative(self, t = None):
+        '''
+        Calculates the derivative, with respect to time, of the
+        Sun's elevation, like `solar_elevation_derivative`
+        
+        @param   t:float?  The time in Julian Centuries, `None`
+                           for the current time
+        @return  :float    The derivative of the Sun's apparent elevation,
+                           in degrees per Julian Century
+        '''
+        t = julian_centuries() if t is None else t
+        if self.precision == 'fast':
+            return solar_elevation_derivative_fast(self.latitude, self.longitude, t)
+        return solar_elevation_derivative(self.latitude, self.longitude, t)
+    
+    def noon(self, t = None):
+        '''
+        Calculates the time of the closest solar noon, like `time_of_solar_noon`
+        
+        @param   t:float?  A time close to the sought time, in Julian
+                           Centuries, `None` for the current time
+        @return  :float    The time, in Julian Centuries,
+                           of the closest solar noon
+        '''
+        return time_of_solar_noon(julian_centuries() if t is None else t, self.longitude)
+    
+    def next(self, elevation, t = None):
+        '''
+        Predict the next time the Sun reaches an elevation, like `future_elevation`
+        
+        @param   elevation:float  The elevation, in degrees
+        @param   t:float?         The time in Julian Centuries, `None`
+                                  for the current time
+        @return  :float?          The calculated time point, `None` if
+                                  none were found within a year
+        '''
+        return self.predict(0.01 / 2000, elevation, t)
+    
+    def previous(self, elevation, t = None):
+        '''
+        Predict the previous time the Sun reached an elevation, like `past_elevation`
+        
+        @param   elevation:float  The elevation, in degrees
+        @param   t:float?         The time in Julian Centuries, `None`
+                                  for the current time
+        @return  :float?          The calculated time point, `None` if
+                                  none were found within a year
+        '''
+        return self.predict(0.01 / -2000, elevation, t)
+    
+    def predict(self, delta, elevation, t = None):
+        '''
+        Predict the next or previous time the Sun reaches
+        or reached an elevation, like `future_past_elevation`
+        
+        @param   delta:float      Negative for past event, positive for
+                                  future event, the steps are always
+                                  half a day
+        @param   elevation:float  The elevation, in degrees
+        @param   t:float?         The time in Julian Centuries, `None`
+                                  for the current time
+        @return  :float?          The calculated time point, `None` if
+                                  none were found within a year
+        '''
+        step = lambda t : solar_noon_or_midnight(delta, self.longitude, t, self.precision)
+        if self.precision == 'fast':
+            return solar_prediction_brent(delta, elevation, self.elevation, FAST_PREDICTION_TOLERANCE, t = t, step = step)[0]
+        return solar_prediction_brent(delta, elevation, self.elevation, t = t, step = step)[0]
+    
+    def daily_events(self, day = None, elevations = DAILY_EVENT_ELEVATIONS):
+        '''
+        Calculates the times of a day's solar events, like `daily_events`
+        
+        @param   day:float?               A time during the day, in Julian Centuries,
+                                          the day is centred around the closest solar
+                                          noon; `None` for the current time
+        @param   elevations:tuple<float>  The elevations, in degrees, to calculate
+                                          the times for
+        @return  :DailyEvents             The times of the day's solar events
+        '''
+        return self.daily_events_near_noon(self.noon(day), elevations)
+    
+    def daily_events_near_noon(self, noon, elevations = DAILY_EVENT_ELEVATIONS):
+        '''
+        Calculates the times of a day's solar events from an approximate
+        time of the solar noon, like `daily_events_near_noon`
+        
+        @param   noon:float               A time, in Julian Centuries, within
+                                          a few minutes of the solar noon
+        @param   elevations:tuple<float>  The elevations, in degrees, to calculate
+                                          the times for
+        @return  :DailyEvents             The times of the day's solar events
+        '''
+        import math
+        if self.precision == 'fast':
+            (d0, e0), dd = solar_ephemeris_fast(noon), solar_declination_derivative_fast(noon)
+            step = 1 / 24 / 36525
+            de = (solar_ephemeris_fast(noon + step)[1] - solar_ephemeris_fast(noon - step)[1]) / (2 * step)
+            tolerance = FAST_PREDICTION_TOLERANCE
+        else:
+            state = solar_state(noon)
+            dstate = solar_state_derivative_from(noon, state, math.sin, math.cos, math.tan)
+            d0, dd = state.declination, dstate.declination
+            e0, de = state.equation_of_time, dstate.equation_of_time
+            tolerance = PREDICTION_TOLERANCE
+        e0, de = e0 / 1440 / 36525, de / 1440 / 36525
+        t = julian_centuries_to_julian_day(noon) + self.longitude / 360
+        t = julian_day_to_julian_centuries(float(int(t + 0.5)) - self.longitude / 360)
+        reference, noon = noon, (t - e0 + de * noon) / (1 + de)
+        sin_lat, cos_lat = self.sin_latitude, self.cos_latitude
+        
+        def crossing(elevation, k):
+            rc = noon
+            for _itr in range(8):
+                d = d0 + dd * (rc - reference)
+                h = (math.sin(elevation) - sin_lat * math.sin(d)) / (cos_lat * math.cos(d))
+                if not -1 <= h <= 1:
+                    return None
+                rc, previous = t - e0 - de * (rc - reference) - k * math.acos(h), rc
+                if abs(rc - previous) <= tolerance:
+                    break
+            return rc
+        
+        rising, setting = [], []
+        for elevation in elevations:
+            elevation = radians(elevation)
+            rising.append(crossing(elevation, 1 / (2 * math.pi) / 36525))
+            setting.append(crossing(elevation, -1 / (2 * math.pi) / 36525))
+        highest = degrees(math.asin(sin_lat * math.sin(d0) + cos_lat * math.cos(d0)))
+        lowest = degrees(math.asin(sin_lat * math.sin(d0) - cos_lat * math.cos(d0)))
+        return DailyEvents(noon, tuple(elevations), tuple(rising), tuple(setting),
+                           lowest > SOLAR_ELEVATION_SUNSET_SUNRISE,
+                           highest < SOLAR_ELEVATION_SUNSET_SUNRISE)
+
+
+def solar_elevation_series(latitude, longitude, t, dt, count = None, refresh = 60):
+    '''
+    Lazily calculate the Sun's elevation as apparent from a geographical
+    position at evenly spaced times
+    
+    The Sun's declination and the equation of time are only calculated
+    once every `refresh` steps, at the middle of those steps, and are
+    linearised around it with their derivatives; between refreshes the
+    sines and cosines of the declination and the solar hour angle are
+    advanced by rotation, so each step costs a handful of multiplications
+    and one arcsine. Each refresh restarts from the exact values, so
+    rounding errors do not accumulate. With a refresh at least every
+    six hours the error is below `SERIES_ELEVATION_ERROR`, and it grows
+    with the square of the time between refreshes
+    
+    @param   latitude:float   The latitude in degrees northwards from
+                              the equator, negative for southwards
+    @param   longitude:float  The longitude in degrees eastwards from
+                              Greenwich, negative for westwards
+    @param   t:float          The time of the first step, in Julian Centuries
+    @param   dt:float         The time between the steps, in Julian Centuries
+    @param   count:int?       The number of steps, `None` for no end
+    @param   refresh:int      The number of steps between the calculations
+                              of the Sun's declination and the equation of time
+    @return  :itr<float>      The Sun's apparent elevation, in degrees, at
+                              `t + k * dt` for each step `k`
+    @throws  ValueError       If `refresh` is less than 1
+    '''
+    import math
+    d2r = 0.017453292519943295 # math.pi / 180
+    sin_lat, cos_lat = math.sin(latitude * d2r), math.cos(latitude * d2r)
+    if refresh < 1:
+        raise ValueError('refresh must be at least 1')
+    
+    def series(k):
+        while count is None or k < count:
+            n = refresh if count is None else min(refresh, count - k)
+            start = t + k * dt
+            centre = start + (n - 1) / 2 * dt
+            state = solar_state(centre)
+            dstate = solar_state_derivative_from(centre, state, math.sin, math.cos, math.tan)
+            d = state.declination + dstate.declination * (start - centre)
+            et = state.equation_of_time + dstate.equation_of_time * (start - centre)
+            h = solar_hour_angle_from(start, longitude, et, math.trunc) * d2r
+            step_d = dstate.declination * dt
+            step_h = (-1440 * 36525 - dstate.equation_of_time) * dt / 4 * d2r
+            sin_d, cos_d, sin_h, cos_h = math.sin(d), math.cos(d), math.sin(h), math.cos(h)
+            sin_sd, cos_sd, sin_sh, cos_sh = math.sin(step_d), math.cos(step_d), math.sin(step_h), math.cos(step_h)
+            for _step in range(n):
+                rc = sin_lat * sin_d + cos_lat * cos_d * cos_h
+                yield math.asin(rc if -1 <= rc <= 1 else math.copysign(1, rc)) / d2r
+                sin_d, cos_d = sin_d * cos_sd + cos_d * sin_sd, cos_d * cos_sd - sin_d * sin_sd
+                sin_h, cos_h = sin_h * cos_sh + cos_h * sin_sh, cos_h * cos_sh - sin_h * sin_sh
+            k += n
+    
+    return series(0)
+
+
+def solar_calendar(latitude, longitude, t = None, days = 365, elevations = DAILY_EVENT_ELEVATIONS):
+    '''
+    Lazily calculate the solar events of consecutive days at a geographical
+    position; each day starts from the previous day's solar noon, so after
+    the first day only one evaluation of the Sun's ephemeris is needed per day
+    
+    @param   latitude:float           The latitude in degrees northwards from
+                                      the equator, negative for southwards
+    @param   longitude:float          The longitude in degrees eastwards from
+                                      Greenwich, negative for westwards
+    @param   t:float?                 A time during the first day, in Julian
+                                      Centuries, `None` for the current time
+    @param   days:int?                The number of days, `None` for no end
+    @param   elevations:tuple<float>  The elevations, in degrees, to calculate
+                                      the times for
+    @return  :itr<DailyEvents>        The times of each day's solar events
+    '''
+    observer = Observer(latitude, longitude)
+    rc = observer.daily_events(t, elevations)
+    day = 0
+    while days is None or day < days:
+        yield rc
+        rc = observer.daily_events_near_noon(rc.noon + 1 / 36525, elevations)
+        day += 1
+
+
+def calendar_columns(elevations = DAILY_EVENT_ELEVATIONS):
+    '''
+    Get the names of the columns written by `write_calendar_csv`
+    and `write_calendar_binary`
+    
+    @param   elevations:tuple<float>  The elevations, in degrees, of the calendar
+    @return  :list<str>               The names of the columns
+    '''
+    rc = ['latitude', 'longitude', 'noon', 'polar_day', 'polar_night']
+    rc += ['rise(%r)' % e for e in elevations]
+    rc += ['set(%r)' % e for e in elevations]
+    return rc
+
+
+def calendar_rows(sites, t = None, days = 365, elevations = DAILY_EVENT_ELEVATIONS):
+    '''
+    Lazily calculate the solar events of consecutive days at a
+    number of geographical positions, as rows of the columns
+    named by `calendar_columns`, site by site and day by day
+    
+    @param   sites:itr<(float, float)>  The latitudes and longitudes of the sites
+    @param   t:float?                   A time during the first day, in Julian
+                                        Centuries, `None` for the current time
+    @param   days:int                   The number of days
+    @param   elevations:tuple<float>    The elevations, in degrees, to calculate
+                                        the times for
+    @return  :itr<tuple<float?>>        For each day and site, the latitude,
+                                        longitude, solar noon, whether it is polar
+                                        day, whether it is polar night, and for each
+                                        elevation the time the Sun rises to it,
+                                        followed by the time the Sun sets to it;
+                                        `None` for events that do not occur
+    '''
+    t = julian_centuries() if t is None else t
+    for (latitude, longitude) in sites:
+        for events in solar_calendar(latitude, longitude, t, days, elevations):
+            yield (latitude, longitude, events.noon, events.polar_day, events.polar_night) + events.rising + events.setting
+
+
+def write_calendar_csv(file, sites, t = None, days = 365, elevations = DAILY_EVENT_ELEVATIONS, convert = None):
+    '''
+    Calculate the solar events of consecutive days at a number of
+    geographical positions and write them, as they are calculated,
+    as CSV with a header line naming the columns
+    
+    @param   file:io.TextIOBase          The file to write to
+    @param   sites:itr<(float, float)>   The latitudes and longitudes of the sites
+    @param   t:float?                    A time during the first day, in Julian
+                                         Centuries, `None` for the current time
+    @param   days:int                    The number of days
+    @param   elevations:tuple<float>     The elevations, in degrees, to calculate
+                                         the times for
+    @param   convert:(float)→float?      Function that converts the times from
+                                         Julian Centuries, for example
+                                         `julian_centuries_to_epoch`
+    @return  :int                        The number of rows written
+    '''
+    import csv
+    writer = csv.writer(file)
+    writer.writerow(calendar_columns(elevations))
+    n = 0
+    for row in calendar_rows(sites, t, days, elevations):
+        row = list(row)
+        row[3] = int(row[3])
+        row[4] = int(row[4])
+        for i in range(2, len(row)):
+            if i in (3, 4):
+                continue
+            elif row[i] is None:
+                row[i] = ''
+            elif convert is not None:
+                row[i] = convert(row[i])
+        writer.writerow(row)
+        n += 1
+    return n
+
+
+CALENDAR_MAGIC = b'SOLARCAL'
+'''
+:bytes  The first bytes of a file written by `write_calendar_binary`
+'''
+
+CALENDAR_VERSION = 1
+'''
+:int  The version of the file format written by `write_calendar_binary`
+'''
+
+
+def write_calendar_binary(file, sites, t = None, days = 365, elevations = DAILY_EVENT_ELEVATIONS):
+    '''
+    Calculate the solar events of consecutive days at a number of
+    geographical positions and write them, site by site, in a binary
+    columnar format
+    
+    The file starts with `CALENDAR_MAGIC`, followed by, as little-endian
+    unsigned 32-bit integers, `CALENDAR_VERSION`, the number of columns
+    and the number of days, followed by the names of the columns, as
+    returned by `calendar_columns`, each encoded in UTF-8 and terminated
+    by a NUL byte, padded with NUL bytes to a multiple of 8 bytes. After
+    this, for each site, each column is stored as one little-endian
+    64-bit float per day; times are in Julian Centuries, NaN for events
+    that do not occur, and the polar day and night flags are 0 or 1
+    
+    @param   file:io.RawIOBase          The file to write to
+    @param   sites:itr<(float, float)>  The latitudes and longitudes of the sites
+    @param   t:float?                   A time during the first day, in Julian
+                                        Centuries, `None` for the current time
+    @param   days:int                   The number of days
+    @param   elevations:tuple<float>    The elevations, in degrees, to calculate
+                                        the times for
+    @return  :int                       The number of sites written
+    '''
+    import array, struct, sys
+    t = julian_centuries() if t is None else t
+    columns = calendar_columns(elevations)
+    header = b''.join(c.encode('utf-8') + b'\0' for c in columns)
+    header = CALENDAR_MAGIC + struct.pack('<III', CALENDAR_VERSION, len(columns), days) + header
+    file.write(header + b'\0' * (-len(header) % 8))
+    nan, n = float('nan'), 0
+    for (latitude, longitude) in sites:
+        data = [array.array('d') for _ in columns]
+        for events in solar_calendar(latitude, longitude, t, days, elevations):
+            row = (latitude, longitude, events.noon, events.polar_day, events.polar_night)
+            for (column, value) in zip(data, row + events.rising + events.setting):
+                column.append(nan if value is None else float(value))
+        for column in data:
+            if sys.byteorder != 'little':
+                column.byteswap()
+            file.write(column.tobytes())
+        n += 1
+    return n
+
+
+def read_calendar_binary(data):
+    '''
+    Parse a file written by `write_calendar_binary`, requires NumPy
+    
+    @param   data:bytes-like              The content of the file, for example
+                                          an `mmap.mmap`, which is not copied
+    @return  :(list<str>, numpy.ndarray)  The names of the columns, and the
+                                          data indexed by site, column and day
+    @throws  ValueError                   If the data is not in a supported format
+    '''
+    import numpy, struct
+    data = memoryview(data)
+    if bytes(data[:len(CALENDAR_MAGIC)]) != CALENDAR_MAGIC:
+        raise ValueError('not a solar calendar file')
+    (version, ncolumns, days) = struct.unpack('<III', data[len(CALENDAR_MAGIC) : len(CALENDAR_MAGIC) + 12])
+    if version != CALENDAR_VERSION:
+        raise ValueError('unsupported solar calendar file version: %i' % version)
+    offset = len(CALENDAR_MAGIC) + 12
+    columns = []
+    for _ in range(ncolumns):
+        end = offset
+        while data[end] != 0:
+            end += 1
+        columns.append(bytes(data[offset : end]).decode('utf-8'))
+        offset = end + 1
+    offset += -offset % 8
+    rc = numpy.frombuffer(data, dtype = '<f8', offset = offset)
+    return (columns, rc.reshape((-1, ncolumns, days)))
+
+
+def calendar_chunk(sites, t, days = 1, elevations = DAILY_EVENT_ELEVATIONS):
+    '''
+    Calculate the solar events of consecutive days at a number of
+    geographical positions as one compact array, this is the
+    work unit of `bulk_calendar`
+    
+    @param   sites:list<(float, float)>  The latitudes and longitudes of the sites
+    @param   t:float                     A time during the first day,
+                                         in Julian Centuries
+    @param   days:int                    The number of days
+    @param   elevations:tuple<float>     The elevations, in degrees, to calculate
+                                         the times for
+    @return  :array.array                The rows of `calendar_rows`, flattened,
+                                         with NaN for events that do not occur
+    '''
+    import array
+    nan, rc = float('nan'), array.array('d')
+    for row in calendar_rows(sites, t, days, elevations):
+        rc.extend(nan if value is None else float(value) for value in row)
+    return rc
+
+
+def bulk_calendar(sites, t = None, days = 1, elevations = DAILY_EVENT_ELEVATIONS,
+                  chunksize = 1024, workers = None, executor = None):
+    '''
+    Calculate the solar events of consecutive days at a large number of
+    geographical positions, sharded over a pool of processes
+    
+    The sites are read, and the results are yielded, a chunk at a time,
+    with at most two chunks per worker in flight, so memory use is
+    bounded regardless of the number of sites
+    
+    @param   sites:itr<(float, float)>                  The latitudes and longitudes of
+                                                        the sites, may be lazy
+    @param   t:float?                                   A time during the first day, in
+                                                        Julian Centuries, `None` for
+                                                        the current time
+    @param   days:int                                   The number of days
+    @param   elevations:tuple<float>                    The elevations, in degrees, to
+                                                        calculate the times for
+    @param   chunksize:int                              The number of sites per chunk
+    @param   workers:int?                               The number of processes, `None`
+                                                        for the number of CPUs; if
+                                                        `executor` is specified, only
+                                                        used to bound the number of
+                                                        chunks in flight
+    @param   executor:concurrent.futures.Executor?      The executor to use, `None`
+                                                        to create a process pool
+    @return  :itr<array.array>                          For each chunk, in input order,
+                                                        the output of `calendar_chunk`:
+                                                        for each site, each day, and
+                                                        each of `calendar_columns`,
+                                                        a float
+    '''
+    import collections, concurrent.futures, itertools, os
+    t = julian_centuries() if t is None else t
+    workers = (os.cpu_count() or 1) if workers is None else workers
+    own = executor is None
+    if own:
+        executor = concurrent.futures.ProcessPoolExecutor(max_workers = workers)
+    sites = iter(sites)
+    pending = collections.deque()
+    try:
+        while True:
+            while len(pending) < 2 * workers:
+                chunk = list(itertools.islice(sites, chunksize))
+                if not chunk:
+                    break
+                pending.append(executor.submit(calendar_chunk, chunk, t, days, elevations))
+            if not pending:
+                break
+            yield pending.popleft().result()
+    finally:
+        for future in pending:
+            future.cancel()
+        if own:
+            executor.shutdown()
+
+
+
+# The following functions are vectorised versions of the functions
+# above. They require NumPy, accept anything `numpy.asarray` accepts
+# (the parameters are broadcast against each other) and return arrays.
+# Their results match their scalar counterparts to within float
+# rounding, except that `future_past_elevation_array`, and thus
+# `future_elevation_array` and `past_elevation_array`, and
+# `polar_periods_array` find the times differently, and agree with
+# their scalar counterparts to within `PREDICTION_TOLERANCE`, and that
+# `solar_elevation_series_array` linearises around other times than
+# `solar_elevation_series`, both within `SERIES_ELEVATION_ERROR` of
+# `solar_elevation` when refreshed at least every six hours.
+# `sunrise_equation_array` and `time_above_elevation_array` match their
+# scalar counterparts, which are themselves approximations, see
+# `SUNRISE_EQUATION_ERROR` and `TIME_ABOVE_ELEVATION_ERROR`.
+# `sun_geometric_mean_longitude`, `sun_geometric_mean_anomaly`,
+# `earth_orbit_eccentricity`, `mean_ecliptic_obliquity`, `radians` and
+# `degrees` are pure arithmetic and accept arrays as is.
+
+
+def julian_day_to_epoch_array(t):
+    '''
+    Converts Julian Day timestamps to POSIX time timestamps
+    
+    @param   t:array  The times in Julian Days
+    @return  :array   The times in POSIX time
+    '''
+    import numpy
+    return julian_day_to_epoch(numpy.asarray(t, dtype = float))
+
+
+def epoch_to_julian_day_array(t):
+    '''
+    Converts POSIX time timestamps to Julian Day timestamps
+    
+    @param   t:array  The times in POSIX time
+    @return  :array   The times in Julian Days
+    '''
+    import numpy
+    return epoch_to_julian_day(numpy.asarray(t, dtype = float))
+
+
+def julian_day_to_julian_centuries_array(t):
+    '''
+    Converts Julian Day timestamps to Julian Centuries timestamps
+    
+    @param   t:array  The times in Julian Days
+    @return  :array   The times in Julian Centuries
+    '''
+    import numpy
+    return julian_day_to_julian_centuries(numpy.asarray(t, dtype = float))
+
+
+def julian_centuries_to_julian_day_array(t):
+    '''
+    Converts Julian Centuries timestamps to Julian Day timestamps
+    
+    @param   t:array  The times in Julian Centuries
+    @return  :array   The times in Julian Days
+    '''
+    import numpy
+    return julian_centuries_to_julian_day(numpy.asarray(t, dtype = float))
+
+
+def epoch_to_julian_centuries_array(t):
+    '''
+    Converts POSIX time timestamps to Julian Centuries timestamps
+    
+    @param   t:array  The times in POSIX time
+    @return  :array   The times in Julian Centuries
+    '''
+    import numpy
+    return epoch_to_julian_centuries(numpy.asarray(t, dtype = float))
+
+
+def julian_centuries_to_epoch_array(t):
+    '''
+    Converts Julian Centuries timestamps to POSIX time timestamps
+    
+    @param   t:array  The times in Julian Centuries
+    @return  :array   The times in POSIX time
+    '''
+    import numpy
+    return julian_centuries_to_epoch(numpy.asarray(t, dtype = float))
+
+
+def sun_equation_of_centre_array(t):
+    '''
+    Calculates the Sun's equation of the centre, the difference between
+    the true anomaly and the mean anomaly
+    
+    @param   t:array  The times in Julian Centuries
+    @return  :array   The Sun's equation of the centre, in radians
+    '''
+    import numpy
+    t = numpy.asarray(t, dtype = float)
+    a = sun_geometric_mean_anomaly(t)
+    rc = numpy.sin(1 * a) * (-0.000014 * t ** 2 - 0.004817 * t + 1.914602)
+    rc += numpy.sin(2 * a) * (-0.000101 * t + 0.019993)
+    rc += numpy.sin(3 * a) * 0.000289
+    return radians(rc)
+
+
+def sun_real_longitude_array(t):
+    '''
+    Calculates the Sun's real longitudinal position
+    
+    @param   t:array  The times in Julian Centuries
+    @return  :array   The longitudes, in radians
+    '''
+    import numpy
+    t = numpy.asarray(t, dtype = float)
+    rc = sun_geometric_mean_longitude(t)
+    return rc + sun_equation_of_centre_array(t)
+
+
+def sun_apparent_longitude_array(t):
+    '''
+    Calculates the Sun's apparent longitudinal position
+    
+    @param   t:array  The times in Julian Centuries
+    @return  :array   The longitudes, in radians
+    '''
+    import numpy
+    t = numpy.asarray(t, dtype = float)
+    rc = degrees(sun_real_longitude_array(t)) - 0.00569
+    rc -= 0.00478 * numpy.sin(radians(-1934.136 * t + 125.04))
+    return radians(rc)
+
+
+def corrected_mean_ecliptic_obliquity_array(t):
+    '''
+    Calculates the mean ecliptic obliquity of the Sun's
+    apparent motion with variation correction
+    
+    @param   t:array  The times in Julian Centuries
+    @return  :array   The mean obliquities, in radians
+    '''
+    import numpy
+    t = numpy.asarray(t, dtype = float)
+    rc = -1934.136 * t + 125.04
+    rc = 0.00256 * numpy.cos(radians(rc))
+    rc += degrees(mean_ecliptic_obliquity(t))
+    return radians(rc)
+
+
+def solar_state_array(t):
+    '''
+    Calculates the Sun's ephemeris in one pass, see `solar_state`
+    
+    @param   t:array      The times in Julian Centuries
+    @return  :SolarState  The Sun's ephemeris, each attribute is an array
+    '''
+    import numpy
+    t = numpy.asarray(t, dtype = float)
+    return solar_state_from(t, numpy.sin, numpy.cos, numpy.tan, numpy.arcsin)
+
+
+def solar_declination_array(t):
+    '''
+    Calculates the Sun's declination
+    
+    @param   t:array  The times in Julian Centuries
+    @return  :array   The Sun's declinations, in radians
+    '''
+    return solar_state_array(t).declination
+
+
+def equation_of_time_array(t):
+    '''
+    Calculates the equation of time, the discrepancy
+    between apparent and mean solar time
+    
+    @param   t:array  The times in Julian Centuries
+    @return  :array   The equation of time, in degrees
+    '''
+    return solar_state_array(t).equation_of_time
+
+
+def hour_angle_from_elevation_array(latitude, declination, elevation):
+    '''
+    Calculates the solar hour angle from the Sun's elevation
+    
+    @param   latitude:array     The latitudes in degrees northwards from
+                                the equator, negative for southwards
+    @param   declination:array  The declinations, in radians
+    @param   elevation:array    The Sun's elevations, in radians
+    @return  :array             The solar hour angles, in radians, of the
+                                times before the solar noon the Sun has
+                                the elevations, NaN where the elevation
+                                is never reached
+    '''
+    import numpy
+    latitude = numpy.asarray(latitude, dtype = float)
+    declination = numpy.asarray(declination, dtype = float)
+    rc = numpy.sin(numpy.asarray(elevation, dtype = float))
+    rc = rc - numpy.sin(radians(latitude)) * numpy.sin(declination)
+    rc /= numpy.cos(radians(latitude)) * numpy.cos(declination)
+    with numpy.errstate(invalid = 'ignore'):
+        return numpy.arccos(rc)
+
+
+def elevation_from_hour_angle_array(latitude, declination, hour_angle):
+    '''
+    Calculates the Sun's elevation from the solar hour angle
+    
+    @param   latitude:array     The latitudes in degrees northwards from
+                                the equator, negative for southwards
+    @param   declination:array  The declinations, in radians
+    @param   hour_angle:array   The solar hour angles, in radians
+    @return  :array             The Sun's elevations, in radians
+    '''
+    import numpy
+    latitude = numpy.asarray(latitude, dtype = float)
+    rc = numpy.cos(radians(latitude))
+    rc = rc * (numpy.cos(hour_angle) * numpy.cos(declination))
+    rc += numpy.sin(radians(latitude)) * numpy.sin(declination)
+    return numpy.arcsin(rc)
+
+
+def solar_elevation_from_time_array(t, latitude, longitude):
+    '''
+    Calculates the Sun's elevation as apparent
+    from geographical positions
+    
+    @param   t:array          The times in Julian Centuries
+    @param   latitude:array   The latitudes in degrees northwards from
+                              the equator, negative for southwards
+    @param   longitude:array  The longitudes in degrees eastwards from
+                              Greenwich, negative for westwards
+    @return  :array           The Sun's apparent elevations at the specified
+                              times as seen from the specified positions,
+                              measured in radians
+    '''
+    import numpy
+    t = numpy.asarray(t, dtype = float)
+    state = solar_state_array(t)
+    rc = solar_hour_angle_from(t, numpy.asarray(longitude, dtype = float), state.equation_of_time, numpy.trunc)
+    rc = radians(rc)
+    return elevation_from_hour_angle_array(latitude, state.declination, rc)
+
+
+def solar_elevation_array(latitude, longitude, t = None):
+    '''
+    Calculates the Sun's elevation as apparent
+    from geographical positions
+    
+    @param   latitude:array   The latitudes in degrees northwards from
+                              the equator, negative for southwards
+    @param   longitude:array  The longitudes in degrees eastwards from
+                              Greenwich, negative for westwards
+    @param   t:array?         The times in Julian Centuries, `None`
+                              for the current time
+    @return  :array           The Sun's apparent elevations at the specified
+                              times as seen from the specified positions,
+                              measured in degrees
+    '''
+    rc = julian_centuries() if t is None else t
+    rc = solar_elevation_from_time_array(rc, latitude, longitude)
+    return degrees(rc)
+
+
+def azimuth_from_hour_angle_array(latitude, declination, hour_angle):
+    '''
+    Calculates the Sun's azimuths from solar hour angles
+    
+    @param   latitude:array     The latitudes in degrees northwards from
+                                the equator, negative for southwards
+    @param   declination:array  The declinations, in radians
+    @param   hour_angle:array   The solar hour angles, in radians,
+                                positive before the solar noon
+    @return  :array             The Sun's azimuths, in radians clockwise
+                                from north, from 0 up to but excluding 2π
+    '''
+    import numpy
+    latitude = radians(numpy.asarray(latitude, dtype = float))
+    cos_d = numpy.cos(declination)
+    rc = numpy.cos(latitude) * numpy.sin(declination)
+    rc = rc - numpy.sin(latitude) * cos_d * numpy.cos(hour_angle)
+    return numpy.arctan2(numpy.sin(hour_angle) * cos_d, rc) % (2 * numpy.pi)
+
+
+def solar_position_array(latitude, longitude, t = None):
+    '''
+    Calculates the Sun's elevation and azimuth as apparent from
+    geographical positions, from a single evaluation of the
+    ephemeris per time
+    
+    @param   latitude:array   The latitudes in degrees northwards from
+                              the equator, negative for southwards
+    @param   longitude:array  The longitudes in degrees eastwards from
+                              Greenwich, negative for westwards
+    @param   t:array?         The times in Julian Centuries, `None`
+                              for the current time
+    @return  :(array, array)  The Sun's apparent elevations, and its azimuths
+                              clockwise from north, at the specified times
+                              as seen from the specified positions,
+                              measured in degrees
+    '''
+    import numpy
+    t = numpy.asarray(julian_centuries() if t is None else t, dtype = float)
+    state = solar_state_array(t)
+    h = solar_hour_angle_from(t, numpy.asarray(longitude, dtype = float), state.equation_of_time, numpy.trunc)
+    h = radians(h)
+    d = state.declination
+    return (degrees(elevation_from_hour_angle_array(latitude, d, h)),
+            degrees(azimuth_from_hour_angle_array(latitude, d, h)))
+
+
+def time_of_solar_noon_array(t, longitude):
+    '''
+    Calculates the times of the closest solar noons
+    
+    @param   t:array          Times close to the sought times,
+                              in Julian Centuries
+    @param   longitude:array  The longitudes in degrees eastwards from
+                              Greenwich, negative for westwards
+    @return  :array           The times, in Julian Centuries,
+                              of the closest solar noons
+    '''
+    import numpy
+    longitude = numpy.asarray(longitude, dtype = float)
+    t = julian_centuries_to_julian_day(numpy.asarray(t, dtype = float)) + longitude / 360
+    t = numpy.floor(t + 0.5) - longitude / 360
+    rc = t
+    for _itr in range(2):
+        rc = t - equation_of_time_array(julian_day_to_julian_centuries(rc)) / 1440
+    return julian_day_to_julian_centuries(rc)
+
+
+def time_of_solar_elevation_array(t, noon, latitude, longitude, elevation):
+    '''
+    Calculates the times the Sun has specified apparent
+    elevations at geographical positions
+    
+    @param   t:array          Times close to the sought times, in Julian
+                              Centuries, the times before the solar noons
+                              are calculated where they are before `noon`,
+                              and the times after the solar noons otherwise
+    @param   noon:array       The times of the closest solar noons
+    @param   latitude:array   The latitudes in degrees northwards from
+                              the equator, negative for southwards
+    @param   longitude:array  The longitudes in degrees eastwards from
+                              Greenwich, negative for westwards
+    @param   elevation:array  The solar elevations, in radians
+    @return  :array           The times, in Julian Centuries, of the specified
+                              elevations, NaN where they are not reached
+    '''
+    import numpy
+    noon = numpy.asarray(noon, dtype = float)
+    longitude = numpy.asarray(longitude, dtype = float)
+    k = numpy.where(numpy.asarray(t) < noon, 1.0, -1.0) / (2 * numpy.pi) / 36525
+    t = julian_centuries_to_julian_day(noon) + longitude / 360
+    t = julian_day_to_julian_centuries(numpy.floor(t + 0.5) - longitude / 360)
+    rc = noon
+    for _itr in range(2):
+        state = solar_state_array(rc)
+        rc = hour_angle_from_elevation_array(latitude, state.declination, elevation)
+        rc = t - state.equation_of_time / 1440 / 36525 - k * rc
+    return rc
+
+
+def future_past_elevation_array(future, latitude, longitude, elevation, t = None):
+    '''
+    Predict the times of the next or previous times the Sun
+    reaches or reached specific elevations
+    
+    The times are calculated in closed form, with `time_of_solar_elevation_array`,
+    for the surrounding days, and refined with a secant step. Where the Sun
+    does not reach the elevation during those days, or barely reaches it so
+    the hour angle is too sensitive to the declination (as described for
+    `time_above_elevation`), they are predicted with `future_past_elevation`
+    
+    @param   future:bool      Whether to predict the next times,
+                              rather than the previous times
+    @param   latitude:array   The latitudes in degrees northwards from
+                              the equator, negative for southwards
+    @param   longitude:array  The longitudes in degrees eastwards from
+                              Greenwich, negative for westwards
+    @param   elevation:array  The elevations of interest, in degrees
+    @param   t:array?         The times in Julian Centuries, `None`
+                              for the current time
+    @return  :array           The calculated time points, NaN where
+                              none were found within a year
+    '''
+    import numpy
+    t = numpy.asarray(julian_centuries() if t is None else t, dtype = float)
+    latitude = numpy.asarray(latitude, dtype = float)
+    longitude = numpy.asarray(longitude, dtype = float)
+    elevation = numpy.asarray(elevation, dtype = float)
+    t, latitude, longitude, elevation = numpy.broadcast_arrays(t, latitude, longitude, elevation)
+    noon = time_of_solar_noon_array(t, longitude)
+    rc = numpy.full(t.shape, numpy.inf if future else -numpy.inf)
+    near = numpy.zeros(t.shape, dtype = bool)
+    sin_e, sin_lat, cos_lat = numpy.sin(radians(elevation)), numpy.sin(radians(latitude)), numpy.cos(radians(latitude))
+    for day in (-1, 0, 1, 2) if future else (-2, -1, 0, 1):
+        day_noon = noon + day / 36525 if day else noon
+        d = solar_declination_array(day_noon)
+        p, q = sin_lat * numpy.sin(d), cos_lat * numpy.cos(d)
+        c = (sin_e - p) / q
+        with numpy.errstate(invalid = 'ignore'):
+            near |= (~(cos_lat * numpy.sqrt(1 - c * c) > 0.2)
+                     & (elevation <= degrees(numpy.arcsin(numpy.fmin(p + q, 1))) + 0.25)
+                     & (elevation >= degrees(numpy.arcsin(numpy.fmax(p - q, -1))) - 0.25))
+        for side in (-1, 1):
+            event = time_of_solar_elevation_array(day_noon + side, day_noon, latitude,
+                                                  longitude, radians(elevation))
+            with numpy.errstate(invalid = 'ignore'):
+                if future:
+                    rc = numpy.where(event > t, numpy.fmin(rc, event), rc)
+                else:
+                    rc = numpy.where(event < t, numpy.fmax(rc, event), rc)
+    rc[numpy.isinf(rc)] = numpy.nan
+    h = 1 / 86400 / 36525
+    e0 = solar_elevation_array(latitude, longitude, rc)
+    e1 = solar_elevation_array(latitude, longitude, rc + h)
+    with numpy.errstate(invalid = 'ignore', divide = 'ignore'):
+        rc = rc - (e0 - elevation) * h / (e1 - e0)
+    delta = 0.01 / 2000 if future else 0.01 / -2000
+    flat, args = rc.reshape(-1), [a.reshape(-1) for a in (latitude, longitude, elevation, t)]
+    for i in numpy.flatnonzero(numpy.isnan(flat) | near.reshape(-1)):
+        event = future_past_elevation(delta, *(float(a[i]) for a in args))
+        flat[i] = numpy.nan if event is None else event
+    return rc
+
+
+def future_elevation_array(latitude, longitude, elevation, t = None):
+    '''
+    Predict the times of the next times the Sun reaches
+    specific elevations, see `future_past_elevation_array`
+    
+    @param   latitude:array   The latitudes in degrees northwards from
+                              the equator, negative for southwards
+    @param   longitude:array  The longitudes in degrees eastwards from
+                              Greenwich, negative for westwards
+    @param   elevation:array  The elevations of interest, in degrees
+    @param   t:array?         The times in Julian Centuries, `None`
+                              for the current time
+    @return  :array           The calculated time points, NaN where
+                              none were found within a year
+    '''
+    return future_past_elevation_array(True, latitude, longitude, elevation, t)
+
+
+def past_elevation_array(latitude, longitude, elevation, t = None):
+    '''
+    Predict the times of the previous times the Sun reached
+    specific elevations, see `future_past_elevation_array`
+    
+    @param   latitude:array   The latitudes in degrees northwards from
+                              the equator, negative for southwards
+    @param   longitude:array  The longitudes in degrees eastwards from
+                              Greenwich, negative for westwards
+    @param   elevation:array  The elevations of interest, in degrees
+    @param   t:array?         The times in Julian Centuries, `None`
+                              for the current time
+    @return  :array           The calculated time points, NaN where
+                              none were found within a year
+    '''
+    return future_past_elevation_array(False, latitude, longitude, elevation, t)
+
+
+def season_array(future, equinox, t = None):
+    '''
+    Predict the times of the next or previous equinoxes or
+    solstices, looked up in the table of equinoxes and solstices;
+    times not covered by the table are predicted individually
+    
+    @param   future:bool   Whether to predict the next events,
+                           rather than the previous events
+    @param   equinox:bool  Whether to predict equinoxes,
+                           rather than solstices
+    @param   t:array?      The times in Julian Centuries, `None`
+                           for the current time
+    @return  :array        The calculated time points
+    '''
+    import numpy
+    t = numpy.asarray(julian_centuries() if t is None else t, dtype = float)
+    rc = numpy.full(t.shape, numpy.nan)
+    table = get_season_table()
+    if table is not None:
+        events = numpy.asarray(table.equinoxes if equinox else table.solstices)
+        if future:
+            i = numpy.searchsorted(events, t, 'left')
+            covered = (table.start <= t) & (i < len(events))
+        else:
+            i = numpy.searchsorted(events, t, 'right') - 1
+            covered = (t <= table.end) & (i >= 0)
+        if len(events):
+            rc = numpy.where(covered, events[numpy.clip(i, 0, len(events) - 1)], numpy.nan)
+    fun = (future_equinox if future else past_equinox) if equinox else (future_solstice if future else past_solstice)
+    flat, t = rc.reshape(-1), t.reshape(-1)
+    for i in numpy.flatnonzero(numpy.isnan(flat)):
+        flat[i] = fun(float(t[i]))
+    return rc
+
+
+def sunrise_equation_array(latitude, longitude, t = None, elevation = SOLAR_ELEVATION_SUNSET_SUNRISE):
+    '''
+    Calculates the times of sunset and sunrise, or of the Sun
+    reaching any other elevation, in closed form, see `sunrise_equation`
+    
+    @param   latitude:array     The latitudes in degrees northwards from
+                                the equator, negative for southwards
+    @param   longitude:array    The longitudes in degrees eastwards from
+                                Greenwich, negative for westwards
+    @param   t:array?           Times during the days, in Julian Centuries,
+                                the days are centred around the closest local
+                                mean noons; `None` for the current time
+    @param   elevation:array    The elevations, in degrees
+    @return  :(array, array, array)  The times of the sunsets and of the sunrises, in
+                                     Julian Centuries, NaN where the Sun does not cross
+                                     the elevation, and 1 where the Sun stays above the
+                                     elevation, -1 where the Sun stays below the
+                                     elevation, and 0 otherwise
+    '''
+    import numpy
+    t = numpy.asarray(julian_centuries() if t is None else t, dtype = float)
+    latitude = numpy.asarray(latitude, dtype = float)
+    longitude = numpy.asarray(longitude, dtype = float)
+    elevation = numpy.asarray(elevation, dtype = float)
+    acos = lambda x : numpy.arccos(numpy.clip(x, -1, 1))
+    _noon, rising, setting, rc = sunrise_equation_from(latitude, longitude, t, elevation, numpy.sin,
+                                                       numpy.cos, numpy.arcsin, acos, numpy.floor,
+                                                       numpy.sqrt)
+    polar = numpy.where(rc > 1, -1, numpy.where(rc < -1, 1, 0))
+    return (numpy.where(polar == 0, setting, numpy.nan),
+            numpy.where(polar == 0, rising, numpy.nan), polar)
+
+
+def time_above_elevation_array(latitude, longitude, elevation, t = None):
+    '''
+    Calculates how long the Sun is above elevations during
+    days, see `time_above_elevation`
+    
+    @param   latitude:array   The latitudes in degrees northwards from
+                              the equator, negative for southwards
+    @param   longitude:array  The longitudes in degrees eastwards from
+                              Greenwich, negative for westwards
+    @param   elevation:array  The elevations, in degrees
+    @param   t:array?         Times during the days, in Julian Centuries,
+                              the days are centred around the closest local
+                              mean noons; `None` for the current time
+    @return  :array           The times, in hours, 24 during polar
+                              day and 0 during polar night; close to
+                              the tangent, see `time_above_elevation`,
+                              the elements are calculated one by one
+    '''
+    import numpy
+    t = numpy.asarray(julian_centuries() if t is None else t, dtype = float)
+    latitude = numpy.asarray(latitude, dtype = float)
+    longitude = numpy.asarray(longitude, dtype = float)
+    elevation = numpy.asarray(elevation, dtype = float)
+    t, latitude, longitude, elevation = numpy.broadcast_arrays(t, latitude, longitude, elevation)
+    noon = julian_centuries_to_julian_day(t) + longitude / 360
+    noon = julian_day_to_julian_centuries(numpy.floor(noon + 0.5) - longitude / 360)
+    state = solar_state_array(noon)
+    dstate = solar_state_derivative_from(noon, state, numpy.sin, numpy.cos, numpy.tan)
+    d = state.declination
+    cos_lat = numpy.cos(radians(latitude))
+    p, q = numpy.sin(radians(latitude)) * numpy.sin(d), cos_lat * numpy.cos(d)
+    c = (numpy.sin(radians(elevation)) - p) / q
+    rc = numpy.arccos(numpy.clip(c, -1, 1)) * (24 / numpy.pi)
+    rc = rc / (1 + dstate.equation_of_time / 1440 / 36525)
+    night = elevation > degrees(numpy.arcsin(numpy.fmin(p + q, 1))) + 0.25
+    day = elevation < degrees(numpy.arcsin(numpy.fmax(p - q, -1))) - 0.25
+    rc = numpy.where(night, 0.0, numpy.where(day, 24.0, rc))
+    near = ~(cos_lat * numpy.sqrt(numpy.fmax(1 - c * c, 0)) > 0.2) & ~night & ~day
+    flat, args = rc.reshape(-1), [a.reshape(-1) for a in (latitude, longitude, elevation, t)]
+    for i in numpy.flatnonzero(near.reshape(-1)):
+        flat[i] = time_above_elevation(*(float(a[i]) for a in args))
+    return rc
+
+
+def daily_durations_array(latitude, longitude, t = None, days = 365,
+                          elevations = DAILY_EVENT_ELEVATIONS, total = False):
+    '''
+    Calculates how long the Sun is above each of a set of elevations
+    during each of a range of days, see `time_above_elevation`; the time
+    within a band of elevations, such as a twilight, is the difference
+    between the times above its edges
+    
+    @param   latitude:array           The latitudes in degrees northwards from
+                                      the equator, negative for southwards
+    @param   longitude:array          The longitudes in degrees eastwards from
+                                      Greenwich, negative for westwards
+    @param   t:float?                 A time during the first day, in Julian
+                                      Centuries, `None` for the current time
+    @param   days:int                 The number of days
+    @param   elevations:tuple<float>  The elevations, in degrees
+    @param   total:bool               Whether to sum over the days
+    @return  :array                   The times, in hours, indexed by day (unless
+                                      `total` is true), by the broadcast shape of
+                                      `latitude` and `longitude`, and by elevation
+    '''
+    import numpy
+    t = julian_centuries() if t is None else t
+    latitude, longitude = numpy.broadcast_arrays(numpy.asarray(latitude, dtype = float),
+                                                 numpy.asarray(longitude, dtype = float))
+    times = t + numpy.arange(days).reshape((days,) + (1,) * (latitude.ndim + 1)) / 36525
+    elevations = numpy.asarray(elevations, dtype = float)
+    rc = time_above_elevation_array(latitude[..., None], longitude[..., None], elevations, times)
+    return rc.sum(axis = 0) if total else rc
+
+
+def have_sunrise_and_sunset_array(latitude, t = None):
+    '''
+    Determine whether solar declination is so that there can be sunrises
+    and sunsets at latitudes, see `have_sunrise_and_sunset`
+    
+    @param   latitude:array  The latitudes in degrees northwards from
+                             the equator, negative for southwards
+    @param   t:array?        The times in Julian Centuries, `None`
+                             for the current time
+    @return  :array          Whether there can be sunrises and sunsets,
+                             as booleans
+    '''
+    import numpy
+    d = degrees(solar_declination_array(julian_centuries() if t is None else t))
+    return numpy.abs(numpy.asarray(latitude, dtype = float)) < 90 - numpy.abs(d)
+
+
+def polar_periods_array(latitude, year):
+    '''
+    Predict the periods of polar day and polar night around the
+    solstices of a year at latitudes, see `polar_periods`
+    
+    The boundaries are found with Newton's method on all latitudes at
+    once, starting from the inverse of a cosine fitted to the declination
+    at the solstice
+    
+    @param   latitude:array  The latitudes in degrees northwards from
+                             the equator, negative for southwards
+    @param   year:int        The year, in the Gregorian calendar
+    @return  :(array, array, array, array)  The beginnings and ends of the polar days
+                                            around the local summer solstices, and of
+                                            the polar nights around the local winter
+                                            solstices, in Julian Centuries, NaN where
+                                            there is no polar day or polar night
+    '''
+    import calendar, numpy
+    latitude = numpy.asarray(latitude, dtype = float)
+    t = epoch_to_julian_centuries(calendar.timegm((year, 1, 1, 0, 0, 0)))
+    june = future_solstice(t)
+    december = future_solstice(june + 1 / 36525)
+    threshold = radians(90 - numpy.abs(latitude))
+    periods = {}
+    for solstice, sign in ((june, 1), (december, -1)):
+        top = abs(solar_declination(solstice))
+        with numpy.errstate(invalid = 'ignore'):
+            offset = numpy.arccos(threshold / top) * (365.2422 / 36525 / (2 * numpy.pi))
+        for side in (-1, 1):
+            rc = solstice + side * offset
+            for _itr in range(4):
+                state = solar_state_array(rc)
+                dstate = solar_state_derivative_from(rc, state, numpy.sin, numpy.cos, numpy.tan)
+                rc = rc - (state.declination - sign * threshold) / dstate.declination
+            periods[(sign, side)] = numpy.where(threshold < top, rc, numpy.nan)
+    north = latitude >= 0
+    return tuple(numpy.where(north, periods[(a, side)], periods[(-a, side)])
+                 for a in (1, -1) for side in (-1, 1))
+
+
+def solar_elevation_series_array(latitude, longitude, t, dt, count, refresh = 60):
+    '''
+    Calculates the Sun's elevation as apparent from a geographical position
+    at evenly spaced times, like `solar_elevation_series`: the Sun's
+    declination and the equation of time are only calculated once every
+    `refresh` steps, and linearised between; the solar hour angle is
+    calculated directly rather than by rotation
+    
+    @param   latitude:float   The latitude in degrees northwards from
+                              the equator, negative for southwards
+    @param   longitude:float  The longitude in degrees eastwards from
+                              Greenwich, negative for westwards
+    @param   t:float          The time of the first step, in Julian Centuries
+    @param   dt:float         The time between the steps, in Julian Centuries
+    @param   count:int        The number of steps
+    @param   refresh:int      The number of steps between the calculations
+                              of the Sun's declination and the equation of time
+    @return  :array           The Sun's apparent elevation, in degrees, at
+                              `t + k * dt` for each step `k`
+    @throws  ValueError       If `refresh` is less than 1
+    '''
+    import numpy
+    if refresh < 1:
+        raise ValueError('refresh must be at least 1')
+    k = numpy.arange(count, dtype = numpy.float64)
+    centres = t + (numpy.arange(0, count, refresh) + (numpy.minimum(refresh, count - numpy.arange(0, count, refresh)) - 1) / 2) * dt
+    state = solar_state_from(centres, numpy.sin, numpy.cos, numpy.tan, numpy.arcsin)
+    dstate = solar_state_derivative_from(centres, state, numpy.sin, numpy.cos, numpy.tan)
+    times = t + k * dt
+    offsets = times - numpy.repeat(centres, refresh)[:count]
+    d = numpy.repeat(state.declination, refresh)[:count] + numpy.repeat(dstate.declination, refresh)[:count] * offsets
+    et = numpy.repeat(state.equation_of_time, refresh)[:count]
+    et += numpy.repeat(dstate.equation_of_time, refresh)[:count] * offsets
+    h = radians(solar_hour_angle_from(times, longitude, et, numpy.trunc))
+    return degrees(elevation_from_hour_angle_array(latitude, d, h))
+
+
+def solar_elevation_grid(latitudes, longitudes, t = None, out = None):
+    '''
+    Calculates the Sun's elevation over a latitude–longitude grid
+    
+    The Sun's declination and the equation of time are calculated once,
+    and the elevation is calculated in separable form: the sine of the
+    elevation is the sum of a per-latitude term and the product of a
+    per-latitude term and a per-longitude term
+    
+    @param   latitudes:array   The latitudes, the rows of the grid, in degrees
+                               northwards from the equator, negative for southwards
+    @param   longitudes:array  The longitudes, the columns of the grid, in degrees
+                               eastwards from Greenwich, negative for westwards
+    @param   t:float?          The time in Julian Centuries, `None`
+                               for the current time
+    @param   out:array?        Array of the shape `(len(latitudes), len(longitudes))`
+                               to store the result in, for example a slice of a
+                               `numpy.memmap`, `None` to allocate a float32 array
+    @return  :array            The Sun's apparent elevations, measured in
+                               degrees, indexed by latitude and longitude
+    '''
+    import numpy
+    t = julian_centuries() if t is None else t
+    latitudes = radians(numpy.asarray(latitudes, dtype = float))
+    longitudes = numpy.asarray(longitudes, dtype = float)
+    if out is None:
+        out = numpy.empty((len(latitudes), len(longitudes)), dtype = numpy.float32)
+    d, et = solar_ephemeris(t)
+    rc = numpy.cos(radians(solar_hour_angle_from(t, longitudes, et, numpy.trunc)))
+    a = numpy.sin(latitudes) * numpy.sin(d)
+    b = numpy.cos(latitudes) * numpy.cos(d)
+    rows = max(1, (1 << 18) // max(1, len(longitudes)))
+    for i in range(0, len(latitudes), rows):
+        block = numpy.multiply.outer(b[i : i + rows], rc)
+        block += a[i : i + rows, None]
+        numpy.clip(block, -1, 1, out = block)
+        out[i : i + rows] = degrees(numpy.arcsin(block, out = block))
+    return out
+
+
+def solar_elevation_grids(latitudes, longitudes, times, out = None):
+    '''
+    Calculates the Sun's elevation over a latitude–longitude
+    grid at a number of times, see `solar_elevation_grid`
+    
+    @param   latitudes:array   The latitudes, in degrees northwards from
+                               the equator, negative for southwards
+    @param   longitudes:array  The longitudes, in degrees eastwards from
+                               Greenwich, negative for westwards
+    @param   times:array       The times in Julian Centuries
+    @param   out:array?        Array of the shape `(len(times), len(latitudes),
+                               len(longitudes))` to store the result in, for
+                               example a `numpy.memmap` so that the rasters need
+                               not fit in memory, `None` to allocate a float32 array
+    @return  :array            The Sun's apparent elevations, measured in degrees,
+                               indexed by time, latitude and longitude
+    '''
+    import numpy
+    times = numpy.asarray(times, dtype = float)
+    if out is None:
+        out = numpy.empty((len(times), len(latitudes), len(longitudes)), dtype = numpy.float32)
+    for (i, t) in enumerate(times):
+        solar_elevation_grid(latitudes, longitudes, float(t), out[i])
+    return out
+
+
+def solar_elevation_raster(filename, latitudes, longitudes, times):
+    '''
+    Calculates the Sun's elevation over a latitude–longitude grid at a
+    number of times, see `solar_elevation_grid`, into a memory-mapped
+    float32 `.npy` file, so that the rasters need not fit in memory
+    
+    @param   filename:str      The file to create, it can be opened again with
+                               `numpy.load(filename, mmap_mode = 'r')`
+    @param   latitudes:array   The latitudes, in degrees northwards from
+                               the equator, negative for southwards
+    @param   longitudes:array  The longitudes, in degrees eastwards from
+                               Greenwich, negative for westwards
+    @param   times:array       The times in Julian Centuries
+    @return  :numpy.memmap     The Sun's apparent elevations, measured in degrees,
+                               indexed by time, latitude and longitude
+    '''
+    import numpy.lib.format
+    shape = (len(times), len(latitudes), len(longitudes))
+    out = numpy.lib.format.open_memmap(filename, mode = 'w+', dtype = 'float32', shape = shape)
+    solar_elevation_grids(latitudes, longitudes, times, out)
+    out.flush()
+    return out
+
+
+def elevation_boundary_array(elevation, t = None, longitudes = 361):
+    '''
+    Calculates where on each meridian the Sun has a specific elevation,
+    for example the day–night terminator or the edges of the twilight bands
+    
+    The Sun's declination and the equation of time are calculated once per
+    time, and `elevation_from_hour_angle` is inverted in closed form: with
+    the hour angle fixed by the longitude, `sin(elevation)` is a sinusoid
+    in the latitude. A meridian crosses the boundary, the circle around the
+    subsolar point, twice, once, or not at all; the lower and upper
+    crossing are returned, and are equal where the boundary surrounds a
+    pole, as the terminator does except at the equinoxes
+    
+    @param   elevation:array   The elevations, in degrees, for example
+                               `SOLAR_ELEVATION_CIVIL_DUSK_DAWN`
+    @param   t:array?          The times in Julian Centuries, `None`
+                               for the current time
+    @param   longitudes:int|array  The number of evenly spaced longitudes from
+                                   -180 to 180 degrees, or the longitudes, in
+                                   degrees eastwards from Greenwich
+    @return  :(array, array, array)  The longitudes, and the lower and the upper
+                                     latitude, in degrees, of the boundary on each
+                                     meridian, indexed by elevation, time and
+                                     longitude; NaN where the meridian does not
+                                     cross the boundary
+    '''
+    import numpy
+    if numpy.ndim(longitudes) == 0:
+        longitudes = numpy.linspace(-180, 180, int(longitudes))
+    longitudes = numpy.asarray(longitudes, dtype = float)
+    t = numpy.asarray(julian_centuries() if t is None else t, dtype = float)
+    elevation = numpy.asarray(elevation, dtype = float)
+    elevation = elevation.reshape(elevation.shape + (1,) * (t.ndim + 1))
+    state = solar_state_array(t)
+    d = state.declination[..., None]
+    h = radians(solar_hour_angle_from(t[..., None], longitudes, state.equation_of_time[..., None], numpy.trunc))
+    # sin(elevation) = sin(latitude + alpha) * r
+    a, b = numpy.sin(d), numpy.cos(d) * numpy.cos(h)
+    r, alpha = numpy.hypot(a, b), numpy.arctan2(b, a)
+    with numpy.errstate(invalid = 'ignore', divide = 'ignore'):
+        rc = numpy.arcsin(numpy.sin(radians(elevation)) / r)
+    rc = [(x + numpy.pi) % (2 * numpy.pi) - numpy.pi for x in (rc - alpha, numpy.pi - rc - alpha)]
+    rc = [numpy.where(numpy.abs(x) <= numpy.pi / 2, x, numpy.nan) for x in rc]
+    return (longitudes, degrees(numpy.fmin(*rc)), degrees(numpy.fmax(*rc)))
+
+
+def terminator_array(t = None, longitudes = 361):
+    '''
+    Calculates where on each meridian the Sun rises or sets,
+    the day–night terminator, see `elevation_boundary_array`
+    
+    @param   t:array?              The times in Julian Centuries, `None`
+                                   for the current time
+    @param   longitudes:int|array  The number of evenly spaced longitudes from
+                                   -180 to 180 degrees, or the longitudes, in
+                                   degrees eastwards from Greenwich
+    @return  :(array, array, array)  The longitudes, and the lower and the upper
+                                     latitude, in degrees, of the terminator on
+                                     each meridian, indexed by time and longitude
+    '''
+    return elevation_boundary_array(SOLAR_ELEVATION_SUNSET_SUNRISE, t, longitudes)
+
+
+
+# The following is an optional table-driven ephemeris. It fits piecewise
+# Chebyshev polynomials to the Sun's declination and the equation of time
+# over a date range, after which looking them up costs a few multiply-adds
+# instead of the full trigonometric series. Once installed with
+# `use_ephemeris` every scalar and prediction function uses it for
+# the times it covers.
+
+
+class ChebyshevEphemeris(object):
+    '''
+    Piecewise Chebyshev polynomials fitted to the Sun's declination and
+    the equation of time, stored in the power basis so that a lookup
+    is a Horner evaluation of two polynomials
+    
+    With the default one-day segments of degree 3, the error is below
+    1e-10 radians for the declination and below 1e-8 degrees (a few
+    microseconds of time) for the equation of time between the years
+    1900 and 2100; the measured errors are available in the attributes
+    `declination_error` and `equation_of_time_error`
+    
+    @variable  start:float                   The first covered time, in Julian Centuries
+    @variable  end:float                     The end of the covered time (exclusive),
+                                             in Julian Centuries
+    @variable  width:float                   The length of each segment, in Julian Centuries
+    @variable  degree:int                    The degree of the polynomials
+    @variable  segments:int                  The number of segments
+    @variable  coefficients:array.array      The coefficients, for each segment the
+                                             `degree + 1` declination coefficients
+                                             followed by the `degree + 1` equation
+                                             of time coefficients, in increasing
+                                             order of the power of the position
+                                             within the segment mapped to [-1, 1]
+    @variable  declination_error:float       The largest error in the declination,
+                                             in radians, measured at the segment
+                                             boundaries when fitted
+    @variable  equation_of_time_error:float  The largest error in the equation of
+                                             time, in degrees, measured at the
+                                             segment boundaries when fitted
+    '''
+    __slots__ = ('start', 'end', 'width', 'degree', 'segments', 'coefficients',
+                 'declination_error', 'equation_of_time_error')
+    
+    def __init__(self, start, end, days = 1, degree = 3):
+        '''
+        Fit the table, which costs `degree + 2` calls to
+        `solar_state` per segment
+        
+        @param  start:float  The first time to cover, in Julian Centuries
+        @param  end:float    The last time to cover, in Julian Centuries
+        @param  days:float   The length of each segment, in days
+        @param  degree:int   The degree of the polynomials
+        '''
+        import array, math
+        n = degree + 1
+        self.start, self.width, self.degree = start, days / 36525.0, degree
+        self.segments = max(1, int(math.ceil((end - start) / self.width)))
+        self.end = start + self.segments * self.width
+        self.coefficients = array.array('d')
+        self.declination_error = self.equation_of_time_error = 0.0
+        nodes = [math.cos(math.pi * (k + 0.5) / n) for k in range(n)]
+        basis = [[math.cos(math.pi * j * (k + 0.5) / n) * 2 / n for k in range(n)] for j in range(n)]
+        for j in range(n):
+            basis[0][j] /= 2
+        powers = [[1.0] + [0.0] * degree, [0.0, 1.0] + [0.0] * (degree - 1)][:n]
+        for j in range(2, n):
+            powers.append([2 * b - c for b, c in zip([0.0] + powers[j - 1][:-1], powers[j - 2])])
+        for i in range(self.segments):
+            a = start + i * self.width
+            states = [solar_state(a + (x + 1) * self.width / 2) for x in nodes]
+            for values in ([s.declination for s in states], [s.equation_of_time for s in states]):
+                chebyshev = [sum(b * v for b, v in zip(bj, values)) for bj in basis]
+                self.coefficients.extend(sum(c * p[k] for c, p in zip(chebyshev, powers)) for k in range(n))
+            d, et = self.lookup(a)
+            state = solar_state(a)
+            self.declination_error = max(self.declination_error, abs(d - state.declination))
+            self.equation_of_time_error = max(self.equation_of_time_error, abs(et - state.equation_of_time))
+    
+    def covers(self, t):
+        '''
+        Determine whether the table covers a time
+        
+        @param   t:float  The time in Julian Centuries
+        @return  :bool    Whether `t` is within the table
+        '''
+        return self.start <= t < self.end
+    
+    def lookup(self, t):
+        '''
+        Look up the Sun's declination and the equation of time
+        
+        @param   t:float           The time in Julian Centuries
+        @return  :(float, float)?  The Sun's declination, in radians, and the
+                                   equation of time, in degrees, `None` if
+                                   `t` is not covered by the table
+        '''
+        x = (t - self.start) / self.width
+        if not 0 <= x < self.segments:
+            return None
+        i = int(x)
+        x = 2 * (x - i) - 1
+        c, n = self.coefficients, self.degree + 1
+        i *= 2 * n
+        if n == 4:
+            return ((((c[i + 3] * x + c[i + 2]) * x + c[i + 1]) * x + c[i]),
+                    (((c[i + 7] * x + c[i + 6]) * x + c[i + 5]) * x + c[i + 4]))
+        d = e = 0.0
+        for j in range(i + n - 1, i - 1, -1):
+            d = d * x + c[j]
+            e = e * x + c[j + n]
+        return (d, e)
+
+
+def use_ephemeris(table):
+    '''
+    Install a table that `solar_declination`, `equation_of_time` and all
+    functions built on them, including the prediction functions, will
+    look up values in instead of calculating them, for times it covers
+    
+    @param   table:ChebyshevEphemeris|EphemerisCache?  The table, `None` to always calculate
+    @return  :ChebyshevEphemeris|EphemerisCache?       The previously installed table
+    '''
+    global ephemeris_table
+    rc, ephemeris_table = ephemeris_table, table
+    return rc
+
+
+
+# The following is an optional cache for the ephemeris. Callers that
+# evaluate many sites at the same time, or the same time repeatedly,
+# can install it with `use_ephemeris` so that the Sun's declination and
+# the equation of time are only calculated once per time.
+
+
+class EphemerisCache(object):
+    '''
+    Thread-safe, bounded cache, for `use_ephemeris`, of the Sun's
+    declination and the equation of time, with least recently
+    used eviction
+    
+    The time can be quantized, in which case all times within
+    `resolution / 2` of a multiple of `resolution` share the values
+    calculated at that multiple; with a resolution of one second,
+    the error is below 5e-8 radians for the declination and below
+    5e-6 degrees for the equation of time
+    
+    @variable  size:int                    The maximum number of cached times
+    @variable  resolution:float            The resolution of the quantization, in
+                                           seconds, zero if times are not quantized
+    @variable  table:ChebyshevEphemeris?   The table that values are looked up in
+                                           before they are calculated with
+                                           `solar_state`, if any
+    @variable  hits:int                    The number of lookups answered from the cache
+    @variable  misses:int                  The number of lookups that were calculated
+    @variable  evictions:int               The number of times that were evicted
+    '''
+    __slots__ = ('size', 'resolution', 'table', 'hits', 'misses', 'evictions', 'quantum', 'entries', 'lock')
+    
+    def __init__(self, size = 4096, resolution = 0, table = None):
+        '''
+        Create an empty cache
+        
+        @param  size:int                    The maximum number of cached times
+        @param  resolution:float            The resolution of the quantization, in
+                                            seconds, zero to cache exact times
+        @param  table:ChebyshevEphemeris?  The table to look up values in before
+                                            calculating them, for example the one
+                                            returned by `use_ephemeris` when the
+                                            cache is installed, `None` for none
+        '''
+        import collections, threading
+        if size < 1:
+            raise ValueError('size must be positive')
+        if resolution < 0:
+            raise ValueError('resolution must not be negative')
+        self.size, self.resolution, self.table = size, resolution, table
+        self.quantum = resolution / 86400 / 36525
+        self.entries = collections.OrderedDict()
+        self.lock = threading.Lock()
+        self.reset()
+    
+    def covers(self, t):
+        '''
+        Determine whether the cache covers a time, which it always does
+        
+        @param   t:float  The time in Julian Centuries
+        @return  :bool    `True`
+        '''
+        return True
+    
+    def lookup(self, t):
+        '''
+        Look up the Sun's declination and the equation of time,
+        and calculate and cache them if they are not cached
+        
+        @param   t:float          The time in Julian Centuries
+        @return  :(float, float)  The Sun's declination, in radians,
+                                  and the equation of time, in degrees
+        '''
+        key = t if not self.quantum else round(t / self.quantum)
+        with self.lock:
+            rc = self.entries.get(key)
+            if rc is not None:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return rc
+            self.misses += 1
+        if self.quantum:
+            t = key * self.quantum
+        rc = None if self.table is None else self.table.lookup(t)
+        if rc is None:
+            state = solar_state(t)
+            rc = (state.declination, state.equation_of_time)
+        with self.lock:
+            self.entries[key] = rc
+            while len(self.entries) > self.size:
+                self.entries.popitem(last = False)
+                self.evictions += 1
+        return rc
+    
+    def reset(self):
+        '''
+        Clear the cache and the statistics
+        '''
+        with self.lock:
+            self.entries.clear()
+            self.hits = self.misses = self.evictions = 0
+    
+    def __len__(self):
+        return len(self.entries)
+    
+    def __repr__(self):
+        return 'EphemerisCache(%s)' % ', '.join('%s=%r' % (k, getattr(self, k)) for k in self.__slots__[:-3])
+
+
+
+# The following is a binary file format for the ephemeris table and the
+# table of equinoxes and solstices. It is written once, and opened with
+# `mmap` by any number of processes, which then share the page-cached
+# file instead of each fitting their own tables on start up.
+
+
+EPHEMERIS_MAGIC = b'SOLAREPH'
+'''
+:bytes  The first bytes of a file written by `write_ephemeris_file`
+'''
+
+EPHEMERIS_VERSION = 1
+'''
+:int  The version of the file format written by `write_ephemeris_file`
+'''
+
+
+def write_ephemeris_file(file, start, end, days = 1, degree = 3):
+    '''
+    Fit a `ChebyshevEphemeris` and a `SeasonTable` over a time
+    range and write them in a binary format, for `EphemerisFile`
+    
+    The file starts with `EPHEMERIS_MAGIC`, followed by, as little-endian
+    unsigned 32-bit integers, `EPHEMERIS_VERSION`, the degree of the
+    polynomials, the number of segments, the number of equinoxes and the
+    number of solstices, followed by 4 NUL bytes, and, as little-endian
+    64-bit floats, the first covered time and the length of each segment,
+    in Julian Centuries, and the largest errors in the declination and
+    the equation of time measured when the table was fitted. After this
+    64-byte header follows, as little-endian 64-bit floats, the
+    coefficients, in the order of `ChebyshevEphemeris.coefficients`,
+    the times of the equinoxes and the times of the solstices, in
+    Julian Centuries
+    
+    @param   file:io.RawIOBase  The file to write to
+    @param   start:float        The first time to cover, in Julian Centuries
+    @param   end:float          The last time to cover, in Julian Centuries
+    @param   days:float         The length of each segment, in days
+    @param   degree:int         The degree of the polynomials
+    @return  :int               The number of bytes written
+    '''
+    import array, struct, sys
+    table = ChebyshevEphemeris(start, end, days, degree)
+    seasons = SeasonTable(table.start, table.end)
+    header = EPHEMERIS_MAGIC + struct.pack('<IIIII4xdddd', EPHEMERIS_VERSION, degree, table.segments,
+                                           len(seasons.equinoxes), len(seasons.solstices),
+                                           table.start, table.width, table.declination_error,
+                                           table.equation_of_time_error)
+    file.write(header)
+    n = len(header)
+    for column in (table.coefficients, array.array('d', seasons.equinoxes), array.array('d', seasons.solstices)):
+        if sys.byteorder != 'little':
+            column = array.array('d', column)
+            column.byteswap()
+        file.write(column.tobytes())
+        n += 8 * len(column)
+    return n
+
+
+class EphemerisFile(ChebyshevEphemeris):
+    '''
+    A `ChebyshevEphemeris`, and a `SeasonTable`, read from a file written
+    by `write_ephemeris_file`, without copying the data, so that it can
+    be shared between processes when the file is mapped into memory
+    
+    @variable  data:memoryview        The content of the file
+    @variable  seasons:SeasonTable    The equinoxes and solstices, the lists of
+                                      times are views into `data`
+    '''
+    __slots__ = ('data', 'seasons')
+    
+    def __init__(self, data):
+        '''
+        Parse the content of a file
+        
+        @param   data:bytes-like  The content of the file, for example an
+                                  `mmap.mmap`, which is not copied
+        @throws  ValueError       If the data is not in a supported format
+        '''
+        import array, struct, sys
+        data = memoryview(data)
+        if bytes(data[:len(EPHEMERIS_MAGIC)]) != EPHEMERIS_MAGIC:
+            raise ValueError('not a solar ephemeris file')
+        (version,) = struct.unpack_from('<I', data, len(EPHEMERIS_MAGIC))
+        if version != EPHEMERIS_VERSION:
+            raise ValueError('unsupported solar ephemeris file version: %i' % version)
+        (_, self.degree, self.segments, nequinoxes, nsolstices, self.start, self.width,
+         self.declination_error, self.equation_of_time_error) = struct.unpack_from('<IIIII4xdddd', data, 8)
+        self.end = self.start + self.segments * self.width
+        ncoefficients = self.segments * 2 * (self.degree + 1)
+        end = 64 + 8 * (ncoefficients + nequinoxes + nsolstices)
+        if len(data) < end:
+            raise ValueError('truncated solar ephemeris file')
+        values = data[64 : end].cast('d')
+        if sys.byteorder != 'little':
+            values = array.array('d', values)
+            values.byteswap()
+        self.data = data
+        self.coefficients = values[:ncoefficients]
+        self.seasons = SeasonTable.__new__(SeasonTable)
+        self.seasons.start, self.seasons.end = self.start, self.end
+        self.seasons.equinoxes = values[ncoefficients : ncoefficients + nequinoxes]
+        self.seasons.solstices = values[ncoefficients + nequinoxes:]
+    
+    def arrays(self):
+        '''
+        Get views of the data as NumPy arrays, without copying, requires NumPy
+        
+        @return  :(numpy.ndarray, numpy.ndarray, numpy.ndarray)  The coefficients, indexed by segment, quantity
+                                                                 (declination or equation of time) and degree,
+                                                                 and the times of the equinoxes and of the
+                                                                 solstices, in Julian Centuries
+        '''
+        import numpy
+        values = numpy.frombuffer(self.data, dtype = '<f8', offset = 64)
+        n = self.segments * 2 * (self.degree + 1)
+        m = n + len(self.seasons.equinoxes)
+        coefficients = values[:n].reshape((self.segments, 2, self.degree + 1))
+        return (coefficients, values[n : m], values[m : m + len(self.seasons.solstices)])
+
+
+def open_ephemeris_file(filename):
+    '''
+    Map a file written by `write_ephemeris_file` into memory
+    
+    @param   filename:str    The pathname of the file
+    @return  :EphemerisFile  The tables in the file
+    @throws  ValueError      If the file is not in a supported format
+    '''
+    import mmap
+    with open(filename, 'rb') as file:
+        data = mmap.mmap(file.fileno(), 0, access = mmap.ACCESS_READ)
+    return EphemerisFile(data)
+
+
+def use_ephemeris_file(filename):
+    '''
+    Map a file written by `write_ephemeris_file` into memory and install
+    its tables with `use_ephemeris` and `use_season_table`, so that
+    the scalar functions use them for the times they cover
+    
+    @param   filename:str                          The pathname of the file
+    @return  :ChebyshevEphemeris|EphemerisCache?  The previously installed
+                                                   ephemeris table
+    @throws  ValueError                            If the file is not in a
+                                                   supported format
+    '''
+    table = open_ephemeris_file(filename)
+    use_season_table(table.seasons)
+    return use_ephemeris(table)
+
+
+
+class PredictionStats(object):
+    '''
+    Instrumentation data of one call to `solar_prediction`
+    or `solar_prediction_brent`, see `use_prediction_observer`
+    
+    @variable  engine:str         'linear' for `solar_prediction`,
+                                  'brent' for `solar_prediction_brent`
+    @variable  scan_steps:int     The number of steps taken to find
+                                  a small time span with the event
+    @variable  iterations:int     The number of iterations of the binary
+                                  search or Brent's method, in that span
+    @variable  evaluations:int    The number of times the predicted
+                                  function was called
+    @variable  elapsed:float      The wall time of the prediction, in seconds
+    @variable  result:float?      The calculated time point, the last estimate
+                                  if the search did not converge, `None`
+                                  if none were found within the time span
+    @variable  converged:bool     Whether the search stopped because the
+                                  tolerance was reached, rather than the
+                                  iteration limit
+    '''
+    __slots__ = ('engine', 'scan_steps', 'iterations', 'evaluations', 'elapsed', 'result', 'converged')
+    
+    def __init__(self, engine, scan_steps, iterations, evaluations, elapsed, result, converged):
+        self.engine = engine
+        self.scan_steps = scan_steps
+        self.iterations = iterations
+        self.evaluations = evaluations
+        self.elapsed = elapsed
+        self.result = result
+        self.converged = converged
+    
+    def __repr__(self):
+        return 'PredictionStats(%s)' % ', '.join('%s=%r' % (k, getattr(self, k)) for k in self.__slots__)
+
+
+class PredictionStatsCollector(object):
+    '''
+    Thread-safe observer, for `use_prediction_observer`,
+    that accumulates `PredictionStats`
+    
+    @variable  predictions:int            The number of predictions
+    @variable  scan_steps:int             The total number of scan steps
+    @variable  iterations:int             The total number of search iterations
+    @variable  evaluations:int            The total number of function evaluations
+    @variable  elapsed:float              The total wall time, in seconds
+    @variable  misses:int                 The number of predictions that found nothing
+    @variable  unconverged:int            The number of predictions that stopped
+                                          at the iteration limit
+    @variable  slowest:PredictionStats?   The slowest prediction
+    '''
+    __slots__ = ('predictions', 'scan_steps', 'iterations', 'evaluations', 'elapsed',
+                 'misses', 'unconverged', 'slowest', 'lock')
+    
+    def __init__(self):
+        import threading
+        self.lock = threading.Lock()
+        self.reset()
+    
+    def __call__(self, stats):
+        '''
+        Add the instrumentation data of a prediction
+        
+        @param  stats:PredictionStats  The instrumentation data
+        '''
+        with self.lock:
+            self.predictions += 1
+            self.scan_steps += stats.scan_steps
+            self.iterations += stats.iterations
+            self.evaluations += stats.evaluations
+            self.elapsed += stats.elapsed
+            self.misses += stats.result is None
+            self.unconverged += stats.result is not None and not stats.converged
+            if self.slowest is None or stats.elapsed > self.slowest.elapsed:
+                self.slowest = stats
+    
+    def reset(self):
+        '''
+        Clear the accumulated data
+        '''
+        self.predictions = self.scan_steps = self.iterations = self.evaluations = 0
+        self.misses = self.unconverged = 0
+        self.elapsed, self.slowest = 0.0, None
+    
+    def __repr__(self):
+        return 'PredictionStatsCollector(%s)' % ', '.join('%s=%r' % (k, getattr(self, k)) for k in self.__slots__[:-1])
+
+
+prediction_observer = None
+'''
+:(PredictionStats)→void?  The function, installed with `use_prediction_observer`,
+                          that is called after each prediction, `None` for none
+'''
+
+
+def use_prediction_observer(observer):
+    '''
+    Install a function that is called with the instrumentation data,
+    a `PredictionStats`, of each call to `solar_prediction` and
+    `solar_prediction_brent`, and thereby of every prediction function;
+    when no function is installed, no instrumentation data is gathered
+    
+    @param   observer:(PredictionStats)→void?  The function, for example a
+                                               `PredictionStatsCollector`,
+                                               `None` to remove it
+    @return  :(PredictionStats)→void?          The previously installed function
+    '''
+    global prediction_observer
+    rc, prediction_observer = prediction_observer, observer
+    return rc
+
+
+def solar_prediction(delta, requested, fun, epsilon = 0.000001, span = 0.01, t = None):
+    '''
+    Predict the time point of the next or previous
+    time an arbitrary condition is meet
+    
+    @param   delta:float          Iteration step size, negative for past
+                                  event, positive for future event
+    @param   requested:float      The value returned by `fun` for which to
+                                  calculate the time point of occurrence
+    @param   fun:(t:float)→float  Function that calculate the data of interest
+    @param   epsilon:float        The tolerance for the result
+    @param   span:float           The number of Julian Centuries (0,01 for
+                                  one year) to restrict the search to
+    @param   t:float?             The time in Julian Centuries, `None` for
+                                  the current time
+    @return  :float?              The calculated time point, `None` if none
+                                  were found within the specified time span;
+                                  if the binary search does not converge
+                                  within 1000 iterations, its last estimate
+    '''
+    fun_ = lambda t : fun(t) - requested
+    t = julian_centuries() if t is None else t
+    observer = prediction_observer
+    if observer is not None:
+        import time
+        start = time.perf_counter()
+    t1 = t2 = t
+    v1 = v0 = fun_(t)
+    steps, itr, tm, bracketed, converged = 0, 0, None, False, False
+    
+    # Predicate time point to within a small time span
+    while True:
+        if abs(t2 - t) > span:
+            break
         t2 += delta
+        steps += 1
         v2 = fun_(t2)
         if (v1 <= 0 <= v2) or ((0 >= v1 >= v2) and (0 <= v0)):
+            bracketed = True
             break
         if (v1 >= 0 >= v2) or ((0 <= v1 <= v2) and (0 >= v0)):
+            bracketed = True
             break
         t1 = t2
         v2 = v1
     
     # Binary search the small time span for the exact time point
-    for _itr in range(1000):
-        tm = (t1 + t2) / 2
-        v1 = fun_(t1)
-        v2 = fun_(t2)
-        vm = fun_(tm)
-        if abs(v1 - v2) < epsilon:
-            return tm
-        if v1 < v2:
-            if 0 < vm:
-                t2 = tm
+    if bracketed:
+        for itr in range(1, 1001):
+            tm = (t1 + t2) / 2
+            v1 = fun_(t1)
+            v2 = fun_(t2)
+            vm = fun_(tm)
+            if abs(v1 - v2) < epsilon:
+                converged = True
+                break
+            if v1 < v2:
+                if 0 < vm:
+                    t2 = tm
+                else:
+                    t1 = tm
+            elif v1 > v2:
+                if 0 > vm:
+                    t2 = tm
+                else:
+                    t1 = tm
+    
+    if observer is not None:
+        elapsed = time.perf_counter() - start
+        observer(PredictionStats('linear', steps, itr, 1 + steps + 3 * itr, elapsed, tm, converged))
+    return tm
+
+
+
+def solar_prediction_brent(delta, requested, fun, tolerance = PREDICTION_TOLERANCE, span = 0.01, t = None, step = None):
+    '''
+    Predict the time point of the next or previous time an arbitrary
+    condition is meet, by stepping until the time point is bracketed
+    and then finding it with Brent's method
+    
+    Unlike `solar_prediction`, `fun` is evaluated only once per time
+    point and the search stops on time resolution rather than on the
+    difference of the values returned by `fun`
+    
+    @param   delta:float          Iteration step size, negative for past
+                                  event, positive for future event
+    @param   requested:float      The value returned by `fun` for which to
+                                  calculate the time point of occurrence
+    @param   fun:(t:float)→float  Function that calculate the data of interest
+    @param   tolerance:float      The tolerance for the result, in
+                                  Julian Centuries
+    @param   span:float           The number of Julian Centuries (0,01 for
+                                  one year) to restrict the search to
+    @param   t:float?             The time in Julian Centuries, `None` for
+                                  the current time
+    @param   step:(float)→float?  Function that returns the time point to step
+                                  to from a time point, instead of adding
+                                  `delta`, for example so that the steps end
+                                  at the extrema of `fun`
+    @return  :(float?, int)       The calculated time point, `None` if none
+                                  were found within the specified time span,
+                                  and the number of times `fun` was called
+    '''
+    t = julian_centuries() if t is None else t
+    observer = prediction_observer
+    if observer is not None:
+        import time
+        start = time.perf_counter()
+    a = b = t
+    fa = fb = fun(t) - requested
+    n = 1
+    
+    # Bracket the time point by stepping
+    while not ((fa <= 0 <= fb) or (fa >= 0 >= fb)) or a == b:
+        if fb == 0 or abs(b - t) > span:
+            break
+        a, fa = b, fb
+        b = b + delta if step is None else step(b)
+        fb = fun(b) - requested
+        n += 1
+    steps = n - 1
+    
+    # Find the time point within the bracket with Brent's method
+    if fb == 0:
+        rc = b
+    elif a == b or not ((fa <= 0 <= fb) or (fa >= 0 >= fb)):
+        rc = None
+    else:
+        rc = brent_bracketed(a, b, fa, fb, requested, fun, tolerance)
+        n += rc[1]
+        rc = rc[0]
+    
+    if observer is not None:
+        elapsed = time.perf_counter() - start
+        observer(PredictionStats('brent', steps, n - 1 - steps, n, elapsed, rc, rc is not None))
+    return (rc, n)
+
+
+def brent_bracketed(a, b, fa, fb, requested, fun, tolerance):
+    '''
+    Find the time point within a bracket where an arbitrary
+    condition is meet with Brent's method
+    
+    @param   a:float              One end of the bracket, in Julian Centuries
+    @param   b:float              The other end of the bracket, in Julian Centuries
+    @param   fa:float             `fun(a) - requested`
+    @param   fb:float             `fun(b) - requested`, must not have the same
+                                  sign as `fa`
+    @param   requested:float      The value returned by `fun` for which to
+                                  calculate the time point of occurrence
+    @param   fun:(t:float)→float  Function that calculate the data of interest
+    @param   tolerance:float      The tolerance for the result, in
+                                  Julian Centuries
+    @return  :(float, int)        The calculated time point, and the
+                                  number of times `fun` was called
+    '''
+    n = 0
+    c, fc = a, fa
+    d = e = b - a
+    while True:
+        if abs(fc) < abs(fb):
+            a, b, c = b, c, b
+            fa, fb, fc = fb, fc, fb
+        tol = 2.2e-16 * abs(b) + tolerance / 2
+        m = (c - b) / 2
+        if abs(m) <= tol or fb == 0:
+            return (b, n)
+        if abs(e) >= tol and abs(fa) > abs(fb):
+            # Inverse quadratic interpolation, or secant method
+            s = fb / fa
+            if a == c:
+                p, q = 2 * m * s, 1 - s
             else:
-                t1 = tm
-        elif v1 > v2:
-            if 0 > vm:
-                t2 = tm
+                q, r = fa / fc, fb / fc
+                p = s * (2 * m * q * (q - r) - (b - a) * (r - 1))
+                q = (q - 1) * (r - 1) * (s - 1)
+            if p > 0:
+                q = -q
+            p = abs(p)
+            if 2 * p < min(3 * m * q - abs(tol * q), abs(e * q)):
+                e, d = d, p / q
             else:
-                t1 = tm
-    return tm
+                d = e = m
+        else:
+            # Bisection
+            d = e = m
+        a, fa = b, fb
+        b += d if abs(d) > tol else (tol if m > 0 else -tol)
+        fb = fun(b) - requested
+        n += 1
+        if fb * fc > 0:
+            c, fc = a, fa
+            d = e = b - a
 
 
 
-def future_past_equinox(delta, t = None):
+def future_past_equinox(delta, t = None, precision = 'default'):
     '''
     Predict the time point of the next or previous equinox
     
-    @param   delta:float  Iteration step size, negative for
-                          past event, positive for future event
-    @param   t:float?     The time in Julian Centuries, `None`
-                          for the current time
-    @return  :float       The calculated time point
+    @param   delta:float    Iteration step size, negative for
+                            past event, positive for future event
+    @param   t:float?       The time in Julian Centuries, `None`
+                            for the current time
+    @param   precision:str  'fast' for the low-precision tier
+    @return  :float         The calculated time point
     '''
-    return solar_prediction(delta, 0, solar_declination, t = t)
+    if fast_precision(precision):
+        fun = lambda t : solar_ephemeris_fast(t)[0]
+        return solar_prediction_brent(delta, 0, fun, FAST_PREDICTION_TOLERANCE, t = t)[0]
+    return solar_prediction_brent(delta, 0, solar_declination, t = t)[0]
 
 
-def future_equinox(t = None):
+def future_equinox(t = None, precision = 'default'):
     '''
     Predict the time point of the next equinox
     
-    @param   t:float?  The time in Julian Centuries, `None`
-                       for the current time
-    @return  :float    The calculated time point
+    @param   t:float?       The time in Julian Centuries, `None`
+                            for the current time
+    @param   precision:str  'fast' for the low-precision tier, the
+                            table is then only used if already built
+    @return  :float         The calculated time point
     '''
-    return future_past_equinox(0.01 / 2000, t)
+    t = julian_centuries() if t is None else t
+    table = season_table if fast_precision(precision) else get_season_table()
+    rc = None if table is None else table.future(table.equinoxes, t)
+    return future_past_equinox(0.01 / 100, t, precision) if rc is None else rc
     
 
-def past_equinox(t = None):
+def past_equinox(t = None, precision = 'default'):
     '''
     Predict the time point of the previous equinox
     
-    @param   t:float?  The time in Julian Centuries, `None`
-                       for the current time
-    @return  :float    The calculated time point
+    @param   t:float?       The time in Julian Centuries, `None`
+                            for the current time
+    @param   precision:str  'fast' for the low-precision tier, the
+                            table is then only used if already built
+    @return  :float         The calculated time point
     '''
-    return future_past_equinox(0.01 / -2000, t)
+    t = julian_centuries() if t is None else t
+    table = season_table if fast_precision(precision) else get_season_table()
+    rc = None if table is None else table.past(table.equinoxes, t)
+    return future_past_equinox(0.01 / -100, t, precision) if rc is None else rc
 
 
 
-def future_past_solstice(delta, t = None):
+def future_past_solstice(delta, t = None, precision = 'default'):
     '''
     Predict the time point of the next or previous solstice
     
-    @param   delta:float  Iteration step size, negative for
-                          past event, positive for future event
-    @param   t:float?     The time in Julian Centuries, `None`
-                          for the current time
-    @return  :float       The calculated time point
+    @param   delta:float    Iteration step size, negative for
+                            past event, positive for future event
+    @param   t:float?       The time in Julian Centuries, `None`
+                            for the current time
+    @param   precision:str  'fast' for the low-precision tier
+    @return  :float         The calculated time point
     '''
-    e = 0.00001
-    fun = solar_declination
-    dfun = lambda t : (fun(t + e) - fun(t - e)) / (2 * e)
-    return solar_prediction(delta, 0, dfun, t = t)
+    if fast_precision(precision):
+        fun = solar_declination_derivative_fast
+        return solar_prediction_brent(delta, 0, fun, FAST_PREDICTION_TOLERANCE, t = t)[0]
+    return solar_prediction_brent(delta, 0, solar_declination_derivative, t = t)[0]
 
 
-def future_solstice(t = None):
+def future_solstice(t = None, precision = 'default'):
     '''
     Predict the time point of the next solstice
     
-    @param   t:float?  The time in Julian Centuries,
-                       `None` for the current time
-    @return  :float    The calculated time point
+    @param   t:float?       The time in Julian Centuries,
+                            `None` for the current time
+    @param   precision:str  'fast' for the low-precision tier, the
+                            table is then only used if already built
+    @return  :float         The calculated time point
     '''
-    return future_past_solstice(0.01 / 2000, t)
+    t = julian_centuries() if t is None else t
+    table = season_table if fast_precision(precision) else get_season_table()
+    rc = None if table is None else table.future(table.solstices, t)
+    return future_past_solstice(0.01 / 100, t, precision) if rc is None else rc
     
 
-def past_solstice(t = None):
+def past_solstice(t = None, precision = 'default'):
     '''
     Predict the time point of the previous solstice
     
-    @param   t:float?  The time in Julian Centuries,
-                       `None` for the current time
-    @return  :float    The calculated time point
+    @param   t:float?       The time in Julian Centuries,
+                            `None` for the current time
+    @param   precision:str  'fast' for the low-precision tier, the
+                            table is then only used if already built
+    @return  :float         The calculated time point
+    '''
+    t = julian_centuries() if t is None else t
+    table = season_table if fast_precision(precision) else get_season_table()
+    rc = None if table is None else table.past(table.solstices, t)
+    return future_past_solstice(0.01 / -100, t, precision) if rc is None else rc
+
+
+
+class SeasonTable(object):
+    '''
+    Sorted table of the equinoxes and solstices within a time range,
+    used by `future_equinox`, `past_equinox`, `future_solstice`
+    and `past_solstice` to find them in logarithmic time
+    
+    @variable  start:float             The beginning of the range, in Julian Centuries
+    @variable  end:float               The end of the range, in Julian Centuries
+    @variable  equinoxes:list<float>   The times of the equinoxes in the
+                                       range, in Julian Centuries
+    @variable  solstices:list<float>   The times of the solstices in the
+                                       range, in Julian Centuries
+    '''
+    __slots__ = ('start', 'end', 'equinoxes', 'solstices')
+    
+    def __init__(self, start, end):
+        '''
+        Calculate the table with `future_past_equinox` and `future_past_solstice`
+        
+        @param  start:float  The beginning of the range, in Julian Centuries
+        @param  end:float    The end of the range, in Julian Centuries
+        '''
+        self.start, self.end = start, end
+        self.equinoxes, self.solstices = [], []
+        for (events, fun) in ((self.equinoxes, future_past_equinox), (self.solstices, future_past_solstice)):
+            t = start
+            while True:
+                t = fun(0.01 / 100, t)
+                if t is None or t > end:
+                    break
+                events.append(t)
+                t += 1 / 36525
+    
+    def future(self, events, t):
+        '''
+        Look up the first event at or after a time
+        
+        @param   events:list<float>  `self.equinoxes` or `self.solstices`
+        @param   t:float             The time in Julian Centuries
+        @return  :float?             The time of the event, `None` if
+                                     not covered by the table
+        '''
+        import bisect
+        i = bisect.bisect_left(events, t)
+        return events[i] if self.start <= t and i < len(events) else None
+    
+    def past(self, events, t):
+        '''
+        Look up the last event at or before a time
+        
+        @param   events:list<float>  `self.equinoxes` or `self.solstices`
+        @param   t:float             The time in Julian Centuries
+        @return  :float?             The time of the event, `None` if
+                                     not covered by the table
+        '''
+        import bisect
+        i = bisect.bisect_right(events, t) - 1
+        return events[i] if t <= self.end and i >= 0 else None
+
+
+season_table = None
+'''
+:SeasonTable?  The table of equinoxes and solstices, built by
+               `get_season_table` on first use
+'''
+
+season_table_range = (-1.0, 1.0)
+'''
+:(float, float)?  The range, in Julian Centuries, of the table of equinoxes
+                  and solstices built on first use, `None` to not build one;
+                  by default the years 1900 to 2100
+'''
+
+
+def get_season_table():
+    '''
+    Get the table of equinoxes and solstices, and
+    build it if it has not been built yet
+    
+    @return  :SeasonTable?  The table, `None` if `season_table`
+                            and `season_table_range` are `None`
+    '''
+    global season_table
+    if season_table is None and season_table_range is not None:
+        season_table = SeasonTable(*season_table_range)
+    return season_table
+
+
+def use_season_table(table):
+    '''
+    Install a table of equinoxes and solstices
+    
+    @param   table:SeasonTable?  The table, `None` to build one
+                                 over `season_table_range` on next use
+    @return  :SeasonTable?       The previously installed table
     '''
-    return future_past_solstice(0.01 / -2000, t)
+    global season_table
+    rc, season_table = season_table, table
+    return rc
 
 
 
-def future_past_elevation(delta, latitude, longitude, elevation, t = None):
+def solar_noon_or_midnight(delta, longitude, t, precision = 'default'):
+    '''
+    Calculates the time of the next or previous solar noon or
+    solar midnight, around which the Sun's elevation has its
+    daily maximum and minimum
+    
+    The extrema are offset from the solar noon and midnight by the
+    change in the Sun's declination, but by no more than a few
+    minutes, so the difference in elevation is negligible
+    
+    @param   delta:float      Negative for the previous time,
+                              positive for the next time
+    @param   longitude:float  The longitude in degrees eastwards from
+                              Greenwich, negative for westwards
+    @param   t:float          The time in Julian Centuries
+    @param   precision:str    'fast' to use `solar_ephemeris_fast`
+    @return  :float           The time, in Julian Centuries, of the first
+                              solar noon or midnight after, or before,
+                              but not at, `t`
+    '''
+    import math
+    ephemeris = solar_ephemeris_fast if fast_precision(precision) else solar_ephemeris
+    k = 2 * (julian_centuries_to_julian_day(t) + longitude / 360)
+    k, direction = (math.floor(k) - 1, 1) if delta > 0 else (math.ceil(k) + 1, -1)
+    while True:
+        k += direction
+        rc = julian_day_to_julian_centuries(k / 2 - longitude / 360)
+        rc -= ephemeris(rc)[1] / 1440 / 36525
+        if (rc - t) * direction > 0:
+            return rc
+
+
+def future_past_elevation(delta, latitude, longitude, elevation, t = None, precision = 'default'):
     '''
     Predict the time point of the next or previous time
     the Sun reaches or reached a specific elevation
     
-    @param   delta:float      Iteration step size, negative for past
-                              event, positive for future event
+    The search steps between solar noons and midnights, see
+    `solar_noon_or_midnight`, between which the Sun's elevation
+    changes monotonically, rather than by a fixed step that a
+    brief crossing could fit within; a time point is only missed
+    if the Sun's daily maximum or minimum passes the elevation
+    by less than about 0.0001 degrees
+    
+    @param   delta:float      Negative for past event, positive for
+                              future event, the steps are always
+                              half a day
     @param   latitude:float   The latitude in degrees northwards from
                               the equator, negative for southwards
     @param   longitude:float  The longitude in degrees eastwards from
@@ -698,14 +3698,19 @@ def future_past_elevation(delta, latitude, longitude, elevation, t = None):
     @param   elevation:float  The elevation of interest
     @param   t:float?         The time in Julian Centuries, `None`
                               for the current time
+    @param   precision:str    'fast' for the low-precision tier
     @return  :float?          The calculated time point, `None` if
                               none were found within a year
     '''
+    step = lambda t : solar_noon_or_midnight(delta, longitude, t, precision)
+    if fast_precision(precision):
+        fun = lambda t : solar_elevation_fast(latitude, longitude, t)
+        return solar_prediction_brent(delta, elevation, fun, FAST_PREDICTION_TOLERANCE, t = t, step = step)[0]
     fun = lambda t : solar_elevation(latitude, longitude, t)
-    return solar_prediction(delta, elevation, fun, t = t)
+    return solar_prediction_brent(delta, elevation, fun, t = t, step = step)[0]
 
 
-def future_elevation(latitude, longitude, elevation, t = None):
+def future_elevation(latitude, longitude, elevation, t = None, precision = 'default'):
     '''
     Predict the time point of the next time the Sun
     reaches a specific elevation
@@ -717,13 +3722,14 @@ def future_elevation(latitude, longitude, elevation, t = None):
     @param   elevation:float  The elevation of interest
     @param   t:float?         The time in Julian Centuries, `None`
                               for the current time
+    @param   precision:str    'fast' for the low-precision tier
     @return  :float?          The calculated time point, `None` if
                               none were found within a year
     '''
-    return future_past_elevation(0.01 / 2000, latitude, longitude, elevation, t)
+    return future_past_elevation(0.01 / 2000, latitude, longitude, elevation, t, precision)
     
 
-def past_elevation(latitude, longitude, elevation, t = None):
+def past_elevation(latitude, longitude, elevation, t = None, precision = 'default'):
     '''
     Predict the time point of the previous time the Sun
     reached a specific elevation
@@ -735,14 +3741,115 @@ def past_elevation(latitude, longitude, elevation, t = None):
     @param   elevation:float  The elevation of interest
     @param   t:float?         The time in Julian Centuries, `None`
                               for the current time
+    @param   precision:str    'fast' for the low-precision tier
+    @return  :float?          The calculated time point, `None` if
+                              none were found within a year
+    '''
+    return future_past_elevation(0.01 / -2000, latitude, longitude, elevation, t, precision)
+
+
+
+def future_past_azimuth(delta, latitude, longitude, azimuth, t = None, precision = 'default'):
+    '''
+    Predict the time point of the next or previous time
+    the Sun reaches or reached a specific azimuth
+    
+    The azimuth wraps around, so rather than using `solar_prediction_brent`
+    directly, the search steps until the difference between the Sun's
+    azimuth and the sought azimuth changes sign without passing through
+    the opposite direction, and then finds the time point with
+    `brent_bracketed`; the Sun is assumed not to pass the azimuth and
+    return within a step, and passes where it sweeps past the azimuth
+    close to the zenith, within a step, can be missed
+    
+    @param   delta:float      Iteration step size, negative for past
+                              event, positive for future event
+    @param   latitude:float   The latitude in degrees northwards from
+                              the equator, negative for southwards
+    @param   longitude:float  The longitude in degrees eastwards from
+                              Greenwich, negative for westwards
+    @param   azimuth:float    The azimuth of interest, in degrees
+                              clockwise from north
+    @param   t:float?         The time in Julian Centuries, `None`
+                              for the current time
+    @param   precision:str    'fast' for the low-precision tier
+    @return  :float?          The calculated time point, `None` if
+                              none were found within a year
+    '''
+    tolerance = FAST_PREDICTION_TOLERANCE if fast_precision(precision) else PREDICTION_TOLERANCE
+    fun = lambda t : (solar_azimuth(latitude, longitude, t, precision) - azimuth + 180) % 360 - 180
+    t = julian_centuries() if t is None else t
+    observer = prediction_observer
+    if observer is not None:
+        import time
+        start = time.perf_counter()
+    a = b = t
+    fa = fb = fun(t)
+    n = 1
+    while fb != 0 and abs(b - t) <= 0.01:
+        a, fa = b, fb
+        b += delta
+        fb = fun(b)
+        n += 1
+        if (fa < 0) != (fb < 0) and abs(fa) < 90 and abs(fb) < 90:
+            break
+    steps = n - 1
+    if fb == 0:
+        rc = b
+    elif a == b or (fa < 0) == (fb < 0) or abs(fa) >= 90 or abs(fb) >= 90:
+        rc = None
+    else:
+        rc = brent_bracketed(a, b, fa, fb, 0, fun, tolerance)
+        n += rc[1]
+        rc = rc[0]
+    if observer is not None:
+        elapsed = time.perf_counter() - start
+        observer(PredictionStats('brent', steps, n - 1 - steps, n, elapsed, rc, rc is not None))
+    return rc
+
+
+def future_azimuth(latitude, longitude, azimuth, t = None, precision = 'default'):
+    '''
+    Predict the time point of the next time the Sun
+    reaches a specific azimuth
+    
+    @param   latitude:float   The latitude in degrees northwards from
+                              the equator, negative for southwards
+    @param   longitude:float  The longitude in degrees eastwards from
+                              Greenwich, negative for westwards
+    @param   azimuth:float    The azimuth of interest, in degrees
+                              clockwise from north
+    @param   t:float?         The time in Julian Centuries, `None`
+                              for the current time
+    @param   precision:str    'fast' for the low-precision tier
+    @return  :float?          The calculated time point, `None` if
+                              none were found within a year
+    '''
+    return future_past_azimuth(1 / 24 / 36525, latitude, longitude, azimuth, t, precision)
+
+
+def past_azimuth(latitude, longitude, azimuth, t = None, precision = 'default'):
+    '''
+    Predict the time point of the previous time the Sun
+    reached a specific azimuth
+    
+    @param   latitude:float   The latitude in degrees northwards from
+                              the equator, negative for southwards
+    @param   longitude:float  The longitude in degrees eastwards from
+                              Greenwich, negative for westwards
+    @param   azimuth:float    The azimuth of interest, in degrees
+                              clockwise from north
+    @param   t:float?         The time in Julian Centuries, `None`
+                              for the current time
+    @param   precision:str    'fast' for the low-precision tier
     @return  :float?          The calculated time point, `None` if
                               none were found within a year
     '''
-    return future_past_elevation(0.01 / -2000, latitude, longitude, elevation, t)
+    return future_past_azimuth(-1 / 24 / 36525, latitude, longitude, azimuth, t, precision)
 
 
 
-def future_past_elevation_derivative(delta, latitude, longitude, derivative, t = None):
+def future_past_elevation_derivative(delta, latitude, longitude, derivative, t = None, precision = 'default'):
     '''
     Predict the time point of the next or previous time the
     Sun reaches or reached a specific elevation derivative
@@ -756,16 +3863,18 @@ def future_past_elevation_derivative(delta, latitude, longitude, derivative, t =
     @param   derivative:float  The elevation derivative value of interest
     @param   t:float?          The time in Julian Centuries, `None`
                                for the current time
+    @param   precision:str     'fast' for the low-precision tier
     @return  :float?           The calculated time point, `None` if
                                none were found within a year
     '''
-    e = 0.00001
-    fun = lambda t : solar_elevation(latitude, longitude, t)
-    dfun = lambda t : (fun(t + e) - fun(t - e)) / (2 * e)
-    return solar_prediction(delta, derivative, dfun, t = t)
+    if fast_precision(precision):
+        dfun = lambda t : solar_elevation_derivative_fast(latitude, longitude, t)
+        return solar_prediction_brent(delta, derivative, dfun, FAST_PREDICTION_TOLERANCE, t = t)[0]
+    dfun = lambda t : solar_elevation_derivative(latitude, longitude, t)
+    return solar_prediction_brent(delta, derivative, dfun, t = t)[0]
 
 
-def future_elevation_derivative(latitude, longitude, derivative, t = None):
+def future_elevation_derivative(latitude, longitude, derivative, t = None, precision = 'default'):
     '''
     Predict the time point of the next time the
     Sun reaches a specific elevation derivative
@@ -777,13 +3886,14 @@ def future_elevation_derivative(latitude, longitude, derivative, t = None):
     @param   derivative:float  The elevation derivative value of interest
     @param   t:float?          The time in Julian Centuries, `None`
                                for the current time
+    @param   precision:str     'fast' for the low-precision tier
     @return  :float?           The calculated time point, `None` if
                                none were found within a year
     '''
-    return future_past_elevation_derivative(0.01 / 2000, latitude, longitude, derivative, t)
+    return future_past_elevation_derivative(0.01 / 2000, latitude, longitude, derivative, t, precision)
     
 
-def past_elevation_derivative(latitude, longitude, derivative, t = None):
+def past_elevation_derivative(latitude, longitude, derivative, t = None, precision = 'default'):
     '''
     Predict the time point of the previous time
     the Sun reached a specific elevation derivative
@@ -795,52 +3905,591 @@ def past_elevation_derivative(latitude, longitude, derivative, t = None):
     @param   derivative:float  The elevation derivative value of interest
     @param   t:float?          The time in Julian Centuries, `None`
                                for the current time
+    @param   precision:str     'fast' for the low-precision tier
     @return  :float?           The calculated time point, `None`
                                if none were found within a year
     '''
-    return future_past_elevation_derivative(0.01 / -2000, latitude, longitude, derivative, t)
+    return future_past_elevation_derivative(0.01 / -2000, latitude, longitude, derivative, t, precision)
 
 
 
-# TODO: This algorithm is imprecise, gives an incorrent sunrise and I do not fully know its behaviour
-def sunrise_equation(latitude, longitude, t = None):
-    import math
-    # Calculate Julian Cycle
-    j_cent = julian_centuries() if t is None else t
-    j_date = julian_centuries_to_julian_day(j_cent)
-    j_cycle = int(j_date - 2451545.0009 - longitude / 360 + 0.5)
+class SolarEvent(object):
+    '''
+    A time the Sun reaches an elevation, as reported by `SolarScheduler`
+    
+    @variable  time:float       The time of the event, in Julian Centuries
+    @variable  elevation:float  The elevation, in degrees
+    @variable  rising:bool      Whether the Sun is rising through
+                                the elevation, rather than setting
+    '''
+    __slots__ = ('time', 'elevation', 'rising')
+    
+    def __init__(self, time, elevation, rising):
+        self.time = time
+        self.elevation = elevation
+        self.rising = rising
+    
+    def __repr__(self):
+        return 'SolarEvent(%s)' % ', '.join('%s=%r' % (k, getattr(self, k)) for k in self.__slots__)
+
+
+class SolarScheduler(object):
+    '''
+    Sleeps until the Sun reaches any of a set of elevations at a
+    geographical position, so that a process can react to solar
+    transitions without polling the Sun's elevation
+    
+    The time of the next transition through each elevation is predicted with
+    `future_past_elevation`; after an event fires, only its elevation is predicted
+    again. Between events the scheduler wakes up at most every `max_sleep`
+    seconds, only to check the wall clock; if it has jumped, for example
+    because it was set or the machine was suspended, every elevation is
+    predicted again from the new time, and events that were jumped over
+    are not reported
+    
+    @variable  latitude:float           The latitude in degrees northwards from
+                                        the equator, negative for southwards
+    @variable  longitude:float          The longitude in degrees eastwards from
+                                        Greenwich, negative for westwards
+    @variable  elevations:tuple<float>  The elevations, in degrees
+    @variable  precision:str            The precision tier of the predictions
+    @variable  max_sleep:float          The longest time, in seconds, to sleep
+                                        without checking the wall clock
+    @variable  max_jump:float           The largest discrepancy, in seconds,
+                                        between the wall clock and the monotonic
+                                        clock that is not considered a jump
+    @variable  pending:list<float?>     For each elevation, the predicted time
+                                        of the next transition, `None` if none
+                                        within a year or not yet predicted
+    @variable  predicted:float?         The time, in Julian Centuries, `pending`
+                                        was last brought up to date for
+    @variable  cancelled:threading.Event  Set by `cancel` to stop the scheduler
+    '''
+    __slots__ = ('latitude', 'longitude', 'elevations', 'precision', 'max_sleep',
+                 'max_jump', 'pending', 'cancelled', 'predicted')
+    
+    def __init__(self, latitude, longitude, elevations = DAILY_EVENT_ELEVATIONS,
+                 precision = 'default', max_sleep = 60, max_jump = 1):
+        '''
+        Constructor
+        
+        @param  latitude:float           The latitude in degrees northwards from
+                                         the equator, negative for southwards
+        @param  longitude:float          The longitude in degrees eastwards from
+                                         Greenwich, negative for westwards
+        @param  elevations:tuple<float>  The elevations, in degrees, for example
+                                         some of the `SOLAR_ELEVATION_*` constants
+        @param  precision:str            'fast' for the low-precision tier
+        @param  max_sleep:float          The longest time, in seconds, to sleep
+                                         without checking the wall clock
+        @param  max_jump:float           The largest discrepancy, in seconds,
+                                         between the wall clock and the monotonic
+                                         clock that is not considered a jump
+        '''
+        import threading
+        fast_precision(precision)
+        self.latitude, self.longitude = latitude, longitude
+        self.elevations = tuple(elevations)
+        self.precision = precision
+        self.max_sleep, self.max_jump = max_sleep, max_jump
+        self.pending = [None] * len(self.elevations)
+        self.predicted = None
+        self.cancelled = threading.Event()
+    
+    def predict_elevation(self, elevation, t):
+        '''
+        Predict the next transition through an elevation, with `future_elevation`
+        
+        @param   elevation:float  The elevation, in degrees
+        @param   t:float          The time in Julian Centuries
+        @return  :float?          The time of the transition, `None`
+                                  if there is none within a year
+        '''
+        return future_elevation(self.latitude, self.longitude, elevation, t, self.precision)
+    
+    def predict(self, t = None):
+        '''
+        Predict the next transition through every elevation
+        
+        @param  t:float?  The time in Julian Centuries, `None`
+                          for the current time
+        '''
+        t = julian_centuries() if t is None else t
+        self.predicted = t
+        for i, elevation in enumerate(self.elevations):
+            self.pending[i] = self.predict_elevation(elevation, t)
+    
+    def next_event(self, t = None):
+        '''
+        Get the next transition, and predict the following
+        transition through the same elevation
+        
+        @param   t:float?     The time in Julian Centuries, `None` for the current
+                              time; the predictions are redone if it is not the
+                              time of the previous event or the last prediction
+        @return  :SolarEvent?  The next transition, `None` if there is
+                               none within a year
+        '''
+        t = julian_centuries() if t is None else t
+        if self.predicted != t:
+            self.predict(t)
+        times = [(rc, i) for i, rc in enumerate(self.pending) if rc is not None]
+        if not times:
+            return None
+        t, i = min(times)
+        elevation = self.elevations[i]
+        if fast_precision(self.precision):
+            rising = solar_elevation_derivative_fast(self.latitude, self.longitude, t) > 0
+        else:
+            rising = solar_elevation_derivative(self.latitude, self.longitude, t) > 0
+        # Start a second later so the same transition is not found again
+        self.pending[i] = self.predict_elevation(elevation, t + 1 / 86400 / 36525)
+        self.predicted = t
+        return SolarEvent(t, elevation, rising)
+    
+    def wait(self, event):
+        '''
+        Sleep until an event, or until the wall clock jumps
+        
+        @param   event:SolarEvent  The event
+        @return  :bool             Whether the event was reached, `False`
+                                   if the clock jumped or `cancel` was called
+        '''
+        import time
+        target = julian_centuries_to_epoch(event.time)
+        while not self.cancelled.is_set():
+            wall, mono = time.time(), time.monotonic()
+            if wall >= target:
+                return True
+            self.cancelled.wait(min(target - wall, self.max_sleep))
+            jump = time.time() - wall - (time.monotonic() - mono)
+            if abs(jump) > self.max_jump:
+                return False
+        return False
+    
+    def __iter__(self):
+        '''
+        Sleep until each transition, and yield it when it occurs,
+        until `cancel` is called or the Sun stops crossing the elevations
+        
+        @return  :itr<SolarEvent>  The transitions
+        '''
+        t = None
+        while not self.cancelled.is_set():
+            event = self.next_event(t)
+            if event is None:
+                break
+            if self.wait(event):
+                t = event.time
+                yield event
+            else:
+                t = None
+    
+    def start(self, callback):
+        '''
+        Call a function at each transition, from a daemon thread,
+        until `cancel` is called
+        
+        @param   callback:(SolarEvent)→void  The function to call
+        @return  :threading.Thread           The thread
+        '''
+        import threading
+        def run():
+            for event in self:
+                callback(event)
+        thread = threading.Thread(target = run, daemon = True)
+        thread.start()
+        return thread
+    
+    def cancel(self):
+        '''
+        Stop the scheduler, the iterator ends without
+        yielding another transition
+        '''
+        self.cancelled.set()
+
+
+
+# The following functions are asyncio counterparts of the scheduler and
+# the bulk calculations. The predictions are run in a shared executor so
+# that the event loop is not blocked, and the waits are timers derived
+# from the predicted times.
+
+prediction_executor = None
+'''
+:concurrent.futures.Executor?  The executor, installed with `use_prediction_executor`,
+                               that the asyncio functions run predictions in, `None`
+                               to create a thread pool on first use
+'''
+
+
+def get_prediction_executor():
+    '''
+    Get the executor the asyncio functions run predictions
+    in, and create a thread pool if none is installed
+    
+    @return  :concurrent.futures.Executor  The executor
+    '''
+    global prediction_executor
+    if prediction_executor is None:
+        import concurrent.futures
+        prediction_executor = concurrent.futures.ThreadPoolExecutor(thread_name_prefix = 'solar')
+    return prediction_executor
+
+
+def use_prediction_executor(executor):
+    '''
+    Install the executor the asyncio functions run predictions in
+    
+    @param   executor:concurrent.futures.Executor?  The executor, `None` to create
+                                                    a thread pool on next use
+    @return  :concurrent.futures.Executor?          The previously installed executor,
+                                                    which is not shut down
+    '''
+    global prediction_executor
+    rc, prediction_executor = prediction_executor, executor
+    return rc
+
+
+async def run_prediction(fun, *args, **kwargs):
+    '''
+    Call a function, typically a prediction function,
+    in the shared executor
+    
+    @param   fun:(...)→¿R?  The function
+    @param   args:*         The positional arguments
+    @param   kwargs:**      The keyword arguments
+    @return  :¿R?           The function's return value
+    '''
+    import asyncio, functools
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_prediction_executor(), functools.partial(fun, *args, **kwargs))
+
+
+async def sleep_until(t, max_sleep = 60, max_jump = 1):
+    '''
+    Sleep until a point in time, or until the wall clock jumps
+    
+    @param   t:float          The time in Julian Centuries
+    @param   max_sleep:float  The longest time, in seconds, to sleep
+                              without checking the wall clock
+    @param   max_jump:float   The largest discrepancy, in seconds,
+                              between the wall clock and the loop's
+                              clock that is not considered a jump
+    @return  :bool            Whether the time was reached, `False`
+                              if the clock jumped
+    '''
+    import asyncio, time
+    loop = asyncio.get_running_loop()
+    target = julian_centuries_to_epoch(t)
+    while True:
+        wall, mono = time.time(), loop.time()
+        if wall >= target:
+            return True
+        await asyncio.sleep(min(target - wall, max_sleep))
+        if abs(time.time() - wall - (loop.time() - mono)) > max_jump:
+            return False
+
+
+async def wait_for_elevation(latitude, longitude, elevation, precision = 'default',
+                             max_sleep = 60, max_jump = 1):
+    '''
+    Sleep until the Sun next reaches an elevation
     
-    # Calculate approximate solar noon and solar man anomaly
-    approx_solar_noon = 451545.0009 + longitude / 360 + j_cycle
-    solar_mean_anomaly = int(357.5291 + 0.98560028 * (j_cycle - 2451545)) % 360
+    @param   latitude:float   The latitude in degrees northwards from
+                              the equator, negative for southwards
+    @param   longitude:float  The longitude in degrees eastwards from
+                              Greenwich, negative for westwards
+    @param   elevation:float  The elevation, in degrees
+    @param   precision:str    'fast' for the low-precision tier
+    @param   max_sleep:float  The longest time, in seconds, to sleep
+                              without checking the wall clock
+    @param   max_jump:float   The largest discrepancy, in seconds, between
+                              the wall clock and the loop's clock that is not
+                              considered a jump; on a jump, the time of the
+                              transition is predicted again
+    @return  :SolarEvent?     The transition, `None` if there is
+                              none within a year
+    '''
+    scheduler = SolarScheduler(latitude, longitude, (elevation,), precision, max_sleep, max_jump)
+    events = solar_events(scheduler = scheduler)
+    try:
+        async for event in events:
+            return event
+        return None
+    finally:
+        await events.aclose()
+
+
+async def solar_events(latitude = None, longitude = None, elevations = DAILY_EVENT_ELEVATIONS,
+                       precision = 'default', max_sleep = 60, max_jump = 1, scheduler = None):
+    '''
+    Sleep until each time the Sun reaches any of a set of elevations at a
+    geographical position, and yield the transitions as they occur, like
+    iterating over a `SolarScheduler`, which does the predictions in the
+    shared executor; the iteration ends if there is no transition within
+    a year or if `cancel` is called on `scheduler`
+    
+    @param   latitude:float?               The latitude in degrees northwards from
+                                           the equator, negative for southwards
+    @param   longitude:float?              The longitude in degrees eastwards from
+                                           Greenwich, negative for westwards
+    @param   elevations:tuple<float>       The elevations, in degrees
+    @param   precision:str                 'fast' for the low-precision tier
+    @param   max_sleep:float               The longest time, in seconds, to sleep
+                                           without checking the wall clock
+    @param   max_jump:float                The largest discrepancy, in seconds,
+                                           between the wall clock and the loop's
+                                           clock that is not considered a jump
+    @param   scheduler:SolarScheduler?     The scheduler to use instead of creating
+                                           one from the other parameters
+    @return  :async-itr<SolarEvent>        The transitions
+    '''
+    if scheduler is None:
+        scheduler = SolarScheduler(latitude, longitude, elevations, precision, max_sleep, max_jump)
+    t = None
+    while not scheduler.cancelled.is_set():
+        event = await run_prediction(scheduler.next_event, t)
+        if event is None:
+            return
+        if await sleep_until(event.time, scheduler.max_sleep, scheduler.max_jump):
+            t = event.time
+            if not scheduler.cancelled.is_set():
+                yield event
+        else:
+            t = None
+
+
+async def bulk_calendar_async(sites, t = None, days = 1, elevations = DAILY_EVENT_ELEVATIONS,
+                              chunksize = 1024, workers = None, executor = None):
+    '''
+    Calculate the solar events of consecutive days at a large number
+    of geographical positions, sharded over a pool of processes,
+    like `bulk_calendar` but without blocking the event loop
+    
+    @param   sites:itr<(float, float)>              The latitudes and longitudes of
+                                                    the sites, may be lazy
+    @param   t:float?                               A time during the first day, in
+                                                    Julian Centuries, `None` for
+                                                    the current time
+    @param   days:int                               The number of days
+    @param   elevations:tuple<float>                The elevations, in degrees, to
+                                                    calculate the times for
+    @param   chunksize:int                          The number of sites per chunk
+    @param   workers:int?                           The number of processes, `None`
+                                                    for the number of CPUs; if
+                                                    `executor` is specified, only
+                                                    used to bound the number of
+                                                    chunks in flight
+    @param   executor:concurrent.futures.Executor?  The executor to use, `None`
+                                                    to create a process pool
+    @return  :async-itr<array.array>                For each chunk, in input
+                                                    order, the output of
+                                                    `calendar_chunk`
+    '''
+    import asyncio, collections, concurrent.futures, itertools, os
+    loop = asyncio.get_running_loop()
+    t = julian_centuries() if t is None else t
+    workers = (os.cpu_count() or 1) if workers is None else workers
+    own = executor is None
+    if own:
+        executor = concurrent.futures.ProcessPoolExecutor(max_workers = workers)
+    sites = iter(sites)
+    pending = collections.deque()
+    try:
+        while True:
+            while len(pending) < 2 * workers:
+                chunk = list(itertools.islice(sites, chunksize))
+                if not chunk:
+                    break
+                pending.append(loop.run_in_executor(executor, calendar_chunk, chunk, t, days, elevations))
+            if not pending:
+                break
+            yield await pending.popleft()
+    finally:
+        for future in pending:
+            future.cancel()
+        if own:
+            executor.shutdown(wait = False)
+
+
+
+def sunrise_equation_from(latitude, longitude, t, elevation, sin, cos, asin, acos, floor, sqrt):
+    '''
+    Calculates the times of the solar noon, and the rising and setting through
+    an elevation, in closed form with the specified mathematical functions;
+    this is the kernel behind `sunrise_equation` and `sunrise_equation_array`
     
-    # Calculate solar equation of centre
-    equation_of_centre  = 1.9148 * math.sin(1 * solar_mean_anomaly)
-    equation_of_centre += 0.0200 * math.sin(2 * solar_mean_anomaly)
-    equation_of_centre += 0.0003 * math.sin(3 * solar_mean_anomaly)
+    The Sun's ephemeris is calculated once, at the local mean noon, with the
+    low-precision formulae of `solar_ephemeris_fast`; the declination is then
+    linearised to find the hour angle of the elevation, and corrected once
+    for the change in declination between the solar noon and each event
     
-    # Calculate solar ecliptic longitude
-    ecliptic_longitude = (solar_mean_anomaly + 102.9372 + equation_of_centre + 180) % 360
+    @param   latitude:float          The latitude in degrees northwards from
+                                     the equator, negative for southwards
+    @param   longitude:float         The longitude in degrees eastwards from
+                                     Greenwich, negative for westwards
+    @param   t:float                 A time during the day, in Julian Centuries,
+                                     the day is centred around the closest
+                                     local mean noon
+    @param   elevation:float         The elevation, in degrees
+    @param   sin:(float)→float       The sine function to use
+    @param   cos:(float)→float       The cosine function to use
+    @param   asin:(float)→float      The arcsine function to use
+    @param   acos:(float)→float      The arccosine function to use, it shall
+                                     clip its argument to [-1, 1]
+    @param   floor:(float)→float     The floor function to use
+    @param   sqrt:(float)→float      The square root function to use
+    @return  :(float, float, float, float)  The time of the solar noon, of the rising,
+                                            and of the setting, in Julian Centuries, and
+                                            the cosine of the hour angle of the elevation
+                                            at the solar noon, which is above 1 if the
+                                            Sun stays below the elevation and below -1
+                                            if the Sun stays above the elevation
+    '''
+    d2r = 0.017453292519943295 # math.pi / 180
+    noon = floor(t * 36525 + longitude / 360 + 0.5) - longitude / 360
+    _sin_g, _cos_g, sin_l, cos_l, sin_e, et = solar_ephemeris_fast_from(noon / 36525, sin, cos)
+    transit = noon - et / 360
+    sin_d = sin_e * sin_l
+    cos_d = sqrt(1 - sin_d * sin_d)
+    dd = sin_e * cos_l * 0.9856474 * d2r / cos_d
+    d = asin(sin_d) + dd * (transit - noon)
+    sin_lat, cos_lat = sin(latitude * d2r), cos(latitude * d2r)
+    sin_el = sin(elevation * d2r)
+    rc = (sin_el - sin_lat * sin(d)) / (cos_lat * cos(d))
+    w = acos(rc) / (2 * 3.141592653589793)
+    events = []
+    for k in (-1, 1):
+        dk = d + k * dd * w
+        events.append((transit + k * acos((sin_el - sin_lat * sin(dk)) / (cos_lat * cos(dk))) / (2 * 3.141592653589793)) / 36525)
+    return (transit / 36525, events[0], events[1], rc)
+
+
+def sunrise_equation(latitude, longitude, t = None, elevation = SOLAR_ELEVATION_SUNSET_SUNRISE):
+    '''
+    Calculates the times of sunset and sunrise, or of the
+    Sun reaching any other elevation, in closed form
     
-    # Calculate solar transit
-    solar_transit  = approx_solar_noon + 0.0053 * math.sin(solar_mean_anomaly)
-    solar_transit -= 0.0069 * math.sin(2 * ecliptic_longitude)
+    This is much faster than `daily_events`, and even more so than
+    `future_elevation` and `past_elevation`, but less accurate:
+    between the years 1900 and 2100 the error is below
+    `SUNRISE_EQUATION_ERROR` within 65 degrees of the equator,
+    it grows towards the poles, and without bound where the
+    Sun barely reaches the elevation
     
-    # Calculate solar declination
-    declination = math.asin(math.sin(ecliptic_longitude) * math.sin(radians(23.45)))
+    @param   latitude:float     The latitude in degrees northwards from
+                                the equator, negative for southwards
+    @param   longitude:float    The longitude in degrees eastwards from
+                                Greenwich, negative for westwards
+    @param   t:float?           A time during the day, in Julian Centuries,
+                                the day is centred around the closest local
+                                mean noon; `None` for the current time
+    @param   elevation:float    The elevation, in degrees
+    @return  :(float?, float?, int)  The time of the sunset, or the Sun setting through
+                                     the elevation, and the time of the sunrise, or the
+                                     Sun rising through the elevation, in Julian
+                                     Centuries, both `None` if the Sun does not cross
+                                     the elevation this day, and 1 if the Sun stays
+                                     above the elevation, -1 if the Sun stays below
+                                     the elevation, and 0 otherwise
+    '''
+    import math
+    t = julian_centuries() if t is None else t
+    acos = lambda x : math.acos(-1.0 if x < -1 else 1.0 if x > 1 else x)
+    _noon, rising, setting, rc = sunrise_equation_from(latitude, longitude, t, elevation, math.sin,
+                                                       math.cos, math.asin, acos, math.floor, math.sqrt)
+    if rc > 1:
+        return (None, None, -1)
+    if rc < -1:
+        return (None, None, 1)
+    return (setting, rising, 0)
+
+
+def main(args = None):
+    '''
+    Command line interface, run with `python -m solar_python`: reads rows
+    of comma-separated values, from a file or stdin, a chunk at a time,
+    calculates one value per row with the vectorised functions, and writes
+    the rows with the value appended to stdout
     
-    # Calculate solar hour angle
-    hour_angle  = math.sin(radians(-0.83))
-    hour_angle -= math.sin(latitude) * math.sin(declination)
-    hour_angle /= math.cos(latitude) * math.cos(declination)
-    hour_angle = degrees(math.acos(hour_angle))
+    The first column of each row is a time, and the second and third
+    columns are the latitude and longitude, except for the equinox and
+    solstice modes that only use the time; in the crossing modes an
+    optional fourth column is the elevation, overriding `--elevation`
     
-    # Calculate time of sunset and sunrise
-    sunset  = 2451545.0009 + (hour_angle + longitude) / 360
-    sunset += j_cycle + solar_transit - approx_solar_noon
-    sunrise = 2 * solar_transit - sunset
+    @param   args:list<str>?  The command line arguments, excluding
+                              the program name, `None` for `sys.argv`
+    @return  :int             The exit status
+    '''
+    import argparse, itertools, sys
+    import numpy
+    modes = {
+        'elevation'         : lambda t, row : solar_elevation_array(row[1], row[2], t),
+        'noon'              : lambda t, row : time_of_solar_noon_array(t, row[2]),
+        'next'              : lambda t, row : future_elevation_array(row[1], row[2], row[3], t),
+        'previous'          : lambda t, row : past_elevation_array(row[1], row[2], row[3], t),
+        'next-equinox'      : lambda t, row : season_array(True, True, t),
+        'previous-equinox'  : lambda t, row : season_array(False, True, t),
+        'next-solstice'     : lambda t, row : season_array(True, False, t),
+        'previous-solstice' : lambda t, row : season_array(False, False, t)}
+    formats = {
+        'epoch'            : (epoch_to_julian_centuries_array, julian_centuries_to_epoch_array),
+        'julian-day'       : (julian_day_to_julian_centuries_array, julian_centuries_to_julian_day_array),
+        'julian-centuries' : (lambda t : t, lambda t : t)}
+    parser = argparse.ArgumentParser(prog = 'python -m solar_python',
+                                     description = 'Calculate solar data for rows of '
+                                                   '"time,latitude,longitude[,elevation]".')
+    parser.add_argument('mode', choices = list(modes),
+                        help = 'the value to append to each row; times are '
+                               'written in the same format as they are read')
+    parser.add_argument('file', nargs = '?', default = '-',
+                        help = 'the file to read, standard input by default')
+    parser.add_argument('-e', '--elevation', type = float, default = SOLAR_ELEVATION_SUNSET_SUNRISE,
+                        help = 'the elevation, in degrees, for the modes "next" and "previous"')
+    parser.add_argument('-t', '--time-format', choices = list(formats), default = 'epoch',
+                        help = 'the format of the times, POSIX time by default')
+    parser.add_argument('-d', '--delimiter', default = ',', help = 'the column delimiter')
+    parser.add_argument('-c', '--chunk-size', type = int, default = 65536,
+                        help = 'the number of rows to process at a time')
+    parser.add_argument('-H', '--header', action = 'store_true',
+                        help = 'skip the first line of the input')
+    args = parser.parse_args(args)
+    fun = modes[args.mode]
+    to_centuries, from_centuries = formats[args.time_format]
+    is_time = args.mode != 'elevation'
     
-    # Convert to Julian Centuries
-    return (julian_day_to_julian_centuries(sunset),
-            julian_day_to_julian_centuries(sunrise))
+    file = sys.stdin if args.file == '-' else open(args.file)
+    try:
+        if args.header:
+            file.readline()
+        while True:
+            lines = list(itertools.islice(file, args.chunk_size))
+            if not lines:
+                break
+            try:
+                data = numpy.loadtxt(lines, delimiter = args.delimiter, ndmin = 2)
+            except ValueError as err:
+                sys.stderr.write('%s: %s\n' % (parser.prog, err))
+                return 1
+            if data.size == 0:
+                continue
+            if data.shape[1] < (1 if args.mode.endswith(('equinox', 'solstice')) else 3):
+                sys.stderr.write('%s: too few columns for mode %s\n' % (parser.prog, args.mode))
+                return 1
+            row = list(data.T)
+            if args.mode in ('next', 'previous') and len(row) < 4:
+                row.append(numpy.full(len(data), args.elevation))
+            rc = fun(to_centuries(row[0]), row)
+            rc = from_centuries(rc) if is_time else rc
+            numpy.savetxt(sys.stdout, numpy.column_stack((data, rc)), fmt = '%.15g',
+                          delimiter = args.delimiter)
+    finally:
+        if file is not sys.stdin:
+            file.close()
+    return 0
+
 
+if __name__ == '__main__':
+    import sys
+    sys.exit(main())